@@ -0,0 +1,137 @@
+"""
+Testes do ZIP dos resultados montado em fluxo (`montar_zip_resultados`,
+`ler_segmentos`) e da interpretação do cabeçalho Range (`intervalo_pedido`).
+
+As funções vivem no server.ipynb: o trecho da célula entre o comentário
+"# ZIP dos resultados montado em fluxo" e `def run_processing` é executado à parte,
+sem FastAPI nem os modelos.
+
+Uso (na raiz do projeto):
+    python -m unittest discover -s backend -p "test_*.py"
+"""
+import io
+import os
+import json
+import time
+import zlib
+import random
+import struct
+import zipfile
+import tempfile
+import functools
+import unittest
+
+CAMINHO_NOTEBOOK = os.path.join(os.path.dirname(os.path.abspath(__file__)), "server.ipynb")
+INICIO_TRECHO = "# ZIP dos resultados montado em fluxo"
+FIM_TRECHO = "def run_processing("
+
+
+def carregar_funcoes() -> dict:
+    """Executa o trecho do notebook com as funções de ZIP e Range e retorna o namespace."""
+    with open(CAMINHO_NOTEBOOK, encoding='utf-8') as f:
+        celulas = [''.join(c['source']) for c in json.load(f)['cells'] if c['cell_type'] == 'code']
+    fonte = next(c for c in celulas if INICIO_TRECHO in c)
+    trecho = fonte[fonte.index(INICIO_TRECHO):fonte.index(FIM_TRECHO)]
+    # Request só aparece nas anotações de tipo
+    ns = {'os': os, 'time': time, 'zlib': zlib, 'struct': struct, 'functools': functools, 'Request': object}
+    exec(compile(trecho, CAMINHO_NOTEBOOK, 'exec'), ns)
+    return ns
+
+
+servidor = carregar_funcoes()
+
+
+class PedidoFalso:
+    """Só o que intervalo_pedido usa de um Request: os cabeçalhos."""
+
+    def __init__(self, **cabecalhos):
+        self.headers = {nome.replace('_', '-'): valor for nome, valor in cabecalhos.items()}
+
+
+class TesteZipResultados(unittest.TestCase):
+    def setUp(self):
+        self.diretorio = tempfile.TemporaryDirectory()
+        self.conteudos = {}
+        for i, nome in enumerate(['grafico_01.png', 'vídeo_joelho.mp4', 'cinematica.npz', 'vazio.txt']):
+            self.conteudos[nome] = os.urandom(70_000 * i + 13)
+            with open(os.path.join(self.diretorio.name, nome), 'wb') as f:
+                f.write(self.conteudos[nome])
+        # miniaturas ficam fora do pacote
+        os.makedirs(os.path.join(self.diretorio.name, '.miniaturas'))
+        self.segmentos, self.total = servidor['montar_zip_resultados'](self.diretorio.name)
+        self.zip = b''.join(servidor['ler_segmentos'](self.segmentos, 0, self.total - 1))
+
+    def tearDown(self):
+        self.diretorio.cleanup()
+
+    def test_tamanho_anunciado(self):
+        self.assertEqual(len(self.zip), self.total)
+
+    def test_ida_e_volta_com_zipfile(self):
+        with zipfile.ZipFile(io.BytesIO(self.zip)) as pacote:
+            self.assertIsNone(pacote.testzip())
+            self.assertEqual(sorted(pacote.namelist()), sorted(self.conteudos))
+            for info in pacote.infolist():
+                self.assertEqual(pacote.read(info), self.conteudos[info.filename])
+                self.assertEqual(info.compress_type, zipfile.ZIP_STORED)
+                self.assertEqual(info.create_system, 3)
+                self.assertEqual(info.external_attr >> 16, 0o100644)
+
+    def test_faixas_de_bytes(self):
+        sorteio = random.Random(0)
+        for _ in range(200):
+            inicio = sorteio.randrange(self.total)
+            fim = sorteio.randrange(inicio, self.total)
+            faixa = b''.join(servidor['ler_segmentos'](self.segmentos, inicio, fim))
+            self.assertEqual(faixa, self.zip[inicio:fim + 1], (inicio, fim))
+
+    def test_crc_atualizado_quando_o_arquivo_muda(self):
+        caminho = os.path.join(self.diretorio.name, 'grafico_01.png')
+        with open(caminho, 'wb') as f:
+            f.write(b'novo conteudo')
+        os.utime(caminho, ns=(0, 10 ** 9))
+        segmentos, total = servidor['montar_zip_resultados'](self.diretorio.name)
+        with zipfile.ZipFile(io.BytesIO(b''.join(servidor['ler_segmentos'](segmentos, 0, total - 1)))) as pacote:
+            self.assertIsNone(pacote.testzip())
+            self.assertEqual(pacote.read('grafico_01.png'), b'novo conteudo')
+
+
+class TesteIntervaloPedido(unittest.TestCase):
+    def intervalo(self, total=1000, etag='"abc"', **cabecalhos):
+        return servidor['intervalo_pedido'](PedidoFalso(**cabecalhos), total, etag)
+
+    def test_sem_range(self):
+        self.assertEqual(self.intervalo(), (0, 999, 200))
+
+    def test_faixas(self):
+        self.assertEqual(self.intervalo(Range='bytes=100-199'), (100, 199, 206))
+        self.assertEqual(self.intervalo(Range='bytes=900-'), (900, 999, 206))
+        self.assertEqual(self.intervalo(Range='bytes=-300'), (700, 999, 206))
+        self.assertEqual(self.intervalo(Range='bytes=-5000'), (0, 999, 206))
+        self.assertEqual(self.intervalo(Range='bytes=990-5000'), (990, 999, 206))
+
+    def test_if_range(self):
+        self.assertEqual(self.intervalo(Range='bytes=100-', If_Range='"abc"'), (100, 999, 206))
+        # conteúdo mudou desde o início do download: o arquivo vem inteiro
+        self.assertEqual(self.intervalo(Range='bytes=100-', If_Range='"outro"'), (0, 999, 200))
+
+    def test_insatisfazivel(self):
+        self.assertEqual(self.intervalo(Range='bytes=1000-')[2], 416)
+        self.assertEqual(self.intervalo(Range='bytes=1000-1200')[2], 416)
+
+    def test_fim_antes_do_inicio_entrega_tudo(self):
+        self.assertEqual(self.intervalo(Range='bytes=500-100'), (0, 999, 200))
+
+    def test_arquivo_vazio(self):
+        for valor in (None, 'bytes=0-', 'bytes=-10', 'bytes=5-9'):
+            cabecalhos = {'Range': valor} if valor else {}
+            self.assertEqual(self.intervalo(total=0, **cabecalhos), (0, -1, 200), valor)
+        self.assertEqual(list(servidor['ler_segmentos']([b''], 0, -1)), [])
+
+    def test_malformado_entrega_tudo(self):
+        for valor in ('bytes=abc-', 'items=0-10', 'bytes=0-10,20-30', 'bytes'):
+            self.assertEqual(self.intervalo(Range=valor), (0, 999, 200), valor)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,338 @@
+"""
+Benchmark de ponta a ponta do protocolo cliente/servidor, sem interface gráfica.
+
+Conduz os próprios workers do app (WorkerUpload, WorkerEventos, WorkerPrevia,
+WorkerDados e, opcionalmente, WorkerDownload) com N clientes simultâneos, do mesmo
+jeito que a janela principal os encadeia, e relata:
+  - vazão do upload (inclui o SHA-256 e a consulta de deduplicação);
+  - tempo até a primeira imagem da galeria e até os dados numéricos;
+  - latência do /status (ida e volta) e atraso dos eventos SSE;
+  - duração dos jobs, vazão de jobs e falhas sob concorrência.
+
+Sem --url, sobe o servidor_simulado.py numa porta livre; as opções que o benchmark
+não reconhece são repassadas a ele (ex: --etapas deteccao=1 --taxa-falha-http 0.05).
+
+Uso:
+    python benchmark/benchmark_cliente.py --clientes 4 --tamanho-video-mb 50 --saida atual.json
+    python benchmark/benchmark_cliente.py --clientes 4 --referencia atual.json   # compara e acusa regressões
+    python benchmark/benchmark_cliente.py --url https://seu-dominio.ngrok-free.app --clientes 1
+"""
+import os
+import sys
+import json
+import time
+import socket
+import argparse
+import tempfile
+import threading
+import subprocess
+
+import requests
+from PyQt5.QtCore import QCoreApplication, Qt
+
+diretorio_atual = os.path.dirname(os.path.abspath(__file__))
+diretorio_raiz = os.path.dirname(diretorio_atual)
+sys.path.append(diretorio_raiz)
+
+from frontend.app import (WorkerUpload, WorkerEventos, WorkerPrevia, WorkerDados, WorkerDownload,
+                          AppBiomecanica, criar_sessao_http)
+
+STATUS_FINAIS = ('concluido', 'erro', 'cancelado')
+
+# Métricas em que um valor maior é melhor (nas demais, maior é pior)
+MAIOR_MELHOR = ('upload_mb_s', 'zip_mb_s', 'jobs_por_min')
+
+
+def conectar(sinal, funcao):
+    """Conexão direta: o slot roda na thread que emite (não há laço de eventos do Qt)."""
+    sinal.connect(funcao, Qt.DirectConnection)
+
+
+class ClienteSimulado:
+    """Um usuário do app: envia um vídeo e acompanha o job como a janela principal faz."""
+
+    def __init__(self, indice: int, url_api: str, caminho_video: str, opcoes):
+        self.indice = indice
+        self.url_api = url_api
+        self.caminho_video = caminho_video
+        self.opcoes = opcoes
+        self.sessao = criar_sessao_http()
+        self.lock = threading.Lock()
+        self.metricas = {'status_rtt_ms': [], 'evento_atraso_ms': [], 'imagens': 0, 'bytes_imagens': 0}
+        self.job_id = None
+        self.final = threading.Event()
+        self.imagens_solicitadas = set()
+        self.downloads = []
+
+    def executar(self):
+        """Fluxo completo de um cliente; qualquer exceção vira a métrica 'erro_cliente'."""
+        try:
+            self._executar()
+        except Exception as e:
+            self.metricas['erro_cliente'] = str(e)
+
+    def _executar(self):
+        m = self.metricas
+        inicio = time.perf_counter()
+
+        # 1. Upload (WorkerUpload: hash, /videos, /uploads em blocos, /processar)
+        resposta, erro = {}, []
+        uploader = WorkerUpload(self.url_api, self.caminho_video, self.opcoes.articulacao, sessao=self.sessao)
+        conectar(uploader.finalizado, resposta.update)
+        conectar(uploader.erro, erro.append)
+        uploader.run()
+        if erro:
+            raise RuntimeError(f"upload: {erro[0]}")
+        m['upload_s'] = time.perf_counter() - inicio
+        m['upload_mb_s'] = os.path.getsize(self.caminho_video) / 1e6 / m['upload_s']
+        self.job_id = resposta['job_id']
+        self.inicio_job = time.perf_counter()
+
+        # 2. Acompanhamento (WorkerEventos) + consultas paralelas ao /status para medir a latência
+        eventos = WorkerEventos(self.url_api, self.job_id)
+        conectar(eventos.status_recebido, self._ao_receber_status)
+        conectar(eventos.erro, lambda e: m.setdefault('erro_eventos', e))
+        thread_status = threading.Thread(target=self._consultar_status, daemon=True)
+        thread_status.start()
+        if self.opcoes.cancelar_apos is not None:
+            threading.Timer(self.opcoes.cancelar_apos, self._cancelar).start()
+        eventos.run()
+        self.final.set()
+        thread_status.join()
+        for thread in self.downloads:
+            thread.join()
+
+        # 3. ZIP completo (opcional)
+        if self.opcoes.zip and m.get('status_final') == 'concluido':
+            destino = os.path.join(tempfile.mkdtemp(), f"{self.job_id}.zip")
+            erro = []
+            download = WorkerDownload(self.url_api, self.job_id, destino, self.sessao)
+            conectar(download.erro, erro.append)
+            inicio_zip = time.perf_counter()
+            download.run()
+            if not erro:
+                m['zip_mb_s'] = os.path.getsize(destino) / 1e6 / (time.perf_counter() - inicio_zip)
+                os.remove(destino)
+
+        m['total_s'] = time.perf_counter() - inicio
+
+    def _ao_receber_status(self, d: dict):
+        """Mesma reação da janela principal a cada status: baixa prévias e dados novos."""
+        agora = time.time()
+        if 'atualizado_em' in d: # só o servidor simulado informa quando o estado mudou
+            self.metricas['evento_atraso_ms'].append(1000 * (agora - float(d['atualizado_em'])))
+
+        status = d.get('status')
+        resultados = d.get('resultados') or []
+        if status in ('processando', 'concluido'):
+            novas = [n for n in resultados if n.endswith(('.png', '.jpg')) and n not in self.imagens_solicitadas
+                     and not any(marcador in n for marcador in AppBiomecanica.MARCADORES_GRAFICOS_NATIVOS)]
+            if novas:
+                self.imagens_solicitadas.update(novas)
+                self._em_segundo_plano(self._baixar_previas, novas)
+            if 'dados_s' not in self.metricas and any(n.endswith('_cinematica.npz') for n in resultados):
+                self.metricas['dados_s'] = None # marca como solicitado
+                self._em_segundo_plano(self._baixar_dados)
+
+        if status in STATUS_FINAIS:
+            self.metricas['status_final'] = status
+            if status == 'cancelado' and 'cancelado_em' in self.metricas:
+                self.metricas['cancelamento_s'] = time.perf_counter() - self.metricas.pop('cancelado_em')
+
+    def _em_segundo_plano(self, funcao, *args):
+        thread = threading.Thread(target=funcao, args=args, daemon=True)
+        self.downloads.append(thread)
+        thread.start()
+
+    def _baixar_previas(self, nomes):
+        previa = WorkerPrevia(self.url_api, self.job_id, nomes, self.sessao, largura=self.opcoes.largura_miniatura)
+
+        def ao_baixar(nome, dados):
+            with self.lock:
+                if 'primeira_imagem_s' not in self.metricas:
+                    self.metricas['primeira_imagem_s'] = time.perf_counter() - self.inicio_job
+                self.metricas['imagens'] += 1
+                self.metricas['bytes_imagens'] += len(dados)
+
+        conectar(previa.imagem_baixada, ao_baixar)
+        conectar(previa.erro, lambda e: self.metricas.setdefault('erro_previa', e))
+        previa.run()
+
+    def _baixar_dados(self):
+        worker = WorkerDados(self.url_api, self.job_id, self.sessao)
+        conectar(worker.dados_recebidos, lambda arrays, tamanho: self.metricas.update(
+            dados_s=time.perf_counter() - self.inicio_job, bytes_dados=tamanho))
+        conectar(worker.erro, lambda e: self.metricas.setdefault('erro_dados', e))
+        worker.run()
+
+    def _consultar_status(self):
+        """Mede a ida e volta do GET /status enquanto o job não termina."""
+        while not self.final.wait(self.opcoes.intervalo_status):
+            inicio = time.perf_counter()
+            try:
+                r = self.sessao.get(f"{self.url_api}/status/{self.job_id}", timeout=10)
+                if r.ok:
+                    self.metricas['status_rtt_ms'].append(1000 * (time.perf_counter() - inicio))
+            except requests.exceptions.RequestException:
+                self.metricas['falhas_status'] = self.metricas.get('falhas_status', 0) + 1
+
+    def _cancelar(self):
+        if not self.final.is_set():
+            self.metricas['cancelado_em'] = time.perf_counter()
+            requests.post(f"{self.url_api}/cancelar/{self.job_id}", timeout=10)
+
+
+def resumo(valores):
+    """n, média, p50, p95 e máximo de uma lista de números."""
+    valores = sorted(v for v in valores if v is not None)
+    if not valores:
+        return None
+    percentil = lambda p: valores[min(int(round(p * (len(valores) - 1))), len(valores) - 1)]
+    return {'n': len(valores), 'media': sum(valores) / len(valores), 'p50': percentil(0.5),
+            'p95': percentil(0.95), 'max': valores[-1]}
+
+
+def agregar(clientes, duracao_s: float) -> dict:
+    """Junta as métricas de todos os clientes em resumos por métrica."""
+    escalares = ('upload_s', 'upload_mb_s', 'primeira_imagem_s', 'dados_s', 'cancelamento_s', 'zip_mb_s', 'total_s')
+    metricas = {nome: resumo([c.metricas.get(nome) for c in clientes]) for nome in escalares}
+    metricas['status_rtt_ms'] = resumo([v for c in clientes for v in c.metricas['status_rtt_ms']])
+    metricas['evento_atraso_ms'] = resumo([v for c in clientes for v in c.metricas['evento_atraso_ms']])
+    metricas = {nome: valor for nome, valor in metricas.items() if valor is not None}
+
+    finais = [c.metricas.get('status_final') for c in clientes]
+    contagem = {status: finais.count(status) for status in STATUS_FINAIS}
+    contagem['erro_cliente'] = sum('erro_cliente' in c.metricas for c in clientes)
+    contagem['falhas_status'] = sum(c.metricas.get('falhas_status', 0) for c in clientes)
+    metricas['jobs_por_min'] = {'n': len(clientes), 'media': 60 * contagem['concluido'] / duracao_s}
+    return {'duracao_s': duracao_s, 'contagem': contagem, 'metricas': metricas}
+
+
+def imprimir(relatorio: dict):
+    print(f"\n{'métrica':<22}{'n':>5}{'média':>10}{'p50':>10}{'p95':>10}{'máx':>10}")
+    for nome, r in relatorio['metricas'].items():
+        colunas = [r.get(c) for c in ('media', 'p50', 'p95', 'max')]
+        print(f"{nome:<22}{r['n']:>5}" + ''.join(f"{v:>10.2f}" if v is not None else f"{'-':>10}" for v in colunas))
+    print(f"\nDuração total: {relatorio['duracao_s']:.1f}s | " + ", ".join(f"{k}: {v}" for k, v in relatorio['contagem'].items()))
+
+
+def comparar(relatorio: dict, referencia: dict, tolerancia: float) -> list:
+    """
+    Compara as médias com um relatório anterior.
+
+    Returns:
+        list: Métricas que pioraram além da tolerância relativa.
+    """
+    regressoes = []
+    print(f"\n{'métrica':<22}{'referência':>12}{'atual':>12}{'variação':>10}")
+    for nome, r in relatorio['metricas'].items():
+        anterior = referencia['metricas'].get(nome)
+        if not anterior or not anterior['media']:
+            continue
+        variacao = (r['media'] - anterior['media']) / abs(anterior['media'])
+        piorou = -variacao if nome in MAIOR_MELHOR else variacao
+        marca = "  << REGRESSÃO" if piorou > tolerancia else ""
+        if marca:
+            regressoes.append(nome)
+        print(f"{nome:<22}{anterior['media']:>12.2f}{r['media']:>12.2f}{100 * variacao:>9.0f}%{marca}")
+    return regressoes
+
+
+def porta_livre() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def subir_servidor_simulado(argumentos_servidor):
+    """Sobe o servidor_simulado.py em outro processo e espera o /health responder."""
+    porta = porta_livre()
+    processo = subprocess.Popen([sys.executable, os.path.join(diretorio_atual, 'servidor_simulado.py'),
+                                 '--porta', str(porta)] + argumentos_servidor)
+    url = f"http://127.0.0.1:{porta}"
+    limite = time.time() + 30
+    while time.time() < limite:
+        if processo.poll() is not None:
+            raise RuntimeError("O servidor simulado não iniciou (veja as opções repassadas a ele).")
+        try:
+            if requests.get(f"{url}/health", timeout=1).ok:
+                return processo, url
+        except requests.exceptions.RequestException:
+            time.sleep(0.2)
+    processo.terminate()
+    raise RuntimeError("O servidor simulado não respondeu ao /health.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', help="API a testar (sem ela, sobe o servidor simulado)")
+    parser.add_argument('--clientes', type=int, default=1, help="Clientes simultâneos")
+    parser.add_argument('--tamanho-video-mb', type=float, default=20, help="Tamanho do vídeo enviado por cliente")
+    parser.add_argument('--mesmo-video', action='store_true', help="Todos enviam o mesmo conteúdo (testa a deduplicação)")
+    parser.add_argument('--intervalo-clientes', type=float, default=0.0, help="Espera (s) entre o início de cada cliente")
+    parser.add_argument('--articulacao', default="Joelho")
+    parser.add_argument('--largura-miniatura', type=int, default=None, help="Pede miniaturas (?w=) na galeria")
+    parser.add_argument('--intervalo-status', type=float, default=0.5, help="Intervalo (s) das consultas ao /status")
+    parser.add_argument('--cancelar-apos', type=float, default=None, help="Cancela cada job após N s de acompanhamento")
+    parser.add_argument('--zip', action='store_true', help="Baixa também o ZIP de cada job concluído")
+    parser.add_argument('--saida', help="Grava o relatório em JSON")
+    parser.add_argument('--referencia', help="Relatório JSON anterior para comparar")
+    parser.add_argument('--tolerancia', type=float, default=0.2, help="Piora relativa aceita na comparação (0.2 = 20%%)")
+    opcoes, argumentos_servidor = parser.parse_known_args()
+
+    QCoreApplication.instance() or QCoreApplication(sys.argv[:1])
+    processo = None
+    if opcoes.url:
+        url = opcoes.url.strip().rstrip('/')
+    else:
+        processo, url = subir_servidor_simulado(argumentos_servidor)
+
+    pasta = tempfile.mkdtemp(prefix="benchmark_videos_")
+    tamanho = int(opcoes.tamanho_video_mb * 1e6)
+    # Um arquivo por cliente: cada app real tem o seu próprio registro de uploads pendentes
+    caminhos = []
+    conteudo = os.urandom(tamanho) if opcoes.mesmo_video else None
+    for i in range(opcoes.clientes):
+        caminho = os.path.join(pasta, f"video_{i}.mp4")
+        with open(caminho, 'wb') as f:
+            f.write(conteudo or os.urandom(tamanho))
+        caminhos.append(caminho)
+
+    try:
+        clientes = [ClienteSimulado(i, url, caminhos[i], opcoes) for i in range(opcoes.clientes)]
+        threads = [threading.Thread(target=c.executar) for c in clientes]
+        inicio = time.perf_counter()
+        for t in threads:
+            t.start()
+            time.sleep(opcoes.intervalo_clientes)
+        for t in threads:
+            t.join()
+        relatorio = agregar(clientes, time.perf_counter() - inicio)
+    finally:
+        if processo is not None:
+            processo.terminate()
+            processo.wait()
+        for caminho in caminhos:
+            os.remove(caminho)
+
+    relatorio['opcoes'] = {**vars(opcoes), 'url': url, 'servidor': argumentos_servidor}
+    for c in clientes:
+        for chave in ('erro_cliente', 'erro_eventos', 'erro_previa', 'erro_dados'):
+            if chave in c.metricas:
+                print(f"Cliente {c.indice} - {chave}: {c.metricas[chave]}")
+    imprimir(relatorio)
+
+    if opcoes.saida:
+        with open(opcoes.saida, 'w', encoding='utf-8') as f:
+            json.dump(relatorio, f, indent=2, ensure_ascii=False)
+    if opcoes.referencia:
+        with open(opcoes.referencia, encoding='utf-8') as f:
+            regressoes = comparar(relatorio, json.load(f), opcoes.tolerancia)
+        if regressoes:
+            print(f"\nRegressões acima de {100 * opcoes.tolerancia:.0f}%: {', '.join(regressoes)}")
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,569 @@
+"""
+Servidor local que imita o protocolo da API do backend/server.ipynb, sem GPU nem
+ngrok, para medir e testar o cliente (frontend/app.py) localmente.
+
+O pipeline é sintético: cada etapa só espera a latência configurada e publica
+artefatos de tamanho configurável (PNGs válidos, vídeos de bytes aleatórios e o
+.npz de /dados), com taxas configuráveis de falha dos jobs e de erros HTTP 503
+transitórios nas consultas.
+
+Uso:
+    python benchmark/servidor_simulado.py --porta 8000 --etapas deteccao=2,ajuste=3 --taxa-falha-job 0.1
+"""
+import os
+import io
+import sys
+import json
+import time
+import uuid
+import array
+import random
+import struct
+import zlib
+import zipfile
+import hashlib
+import asyncio
+import argparse
+import tempfile
+import threading
+from collections import OrderedDict
+
+from fastapi import FastAPI, UploadFile, File, HTTPException, Form, Request
+from fastapi.responses import JSONResponse, StreamingResponse, Response
+from fastapi.concurrency import run_in_threadpool
+import uvicorn
+
+# Mesmas etapas e faixas de progresso do pipeline real (FAIXAS_PROGRESSO)
+FAIXAS_PROGRESSO = OrderedDict([
+    ('deteccao', (0, 40)),
+    ('ajuste', (40, 75)),
+    ('marcha', (75, 85)),
+    ('renderizacao', (85, 100)),
+])
+# Latência padrão (s) de cada etapa
+LATENCIAS_PADRAO = {'deteccao': 2.0, 'ajuste': 3.0, 'marcha': 1.0, 'renderizacao': 2.0}
+
+# Artefatos publicados ao fim de cada etapa: (etapa, sufixo do arquivo, tipo)
+ARTEFATOS = [
+    ('deteccao', '_01_frame_inicial.png', 'imagem'),
+    ('deteccao', '_02_visualizacao_esqueleto.png', 'imagem'),
+    ('ajuste', '_03_angulo_{articulacao}.png', 'imagem'),
+    ('marcha', '_04_fase_marcha.png', 'imagem'),
+    ('marcha', '_05_erro_kalman.png', 'imagem'),
+    ('marcha', '_06_estado_kalman.png', 'imagem'),
+    ('marcha', '_cinematica.npz', 'dados'),
+    ('renderizacao', '_reconstrucao.mp4', 'video'),
+    ('renderizacao', '_overlay.mp4', 'video'),
+]
+
+ARTICULACOES = OrderedDict([
+    ("Joelho", "Flexão do Joelho"),
+    ("Quadril", "Flexão do Quadril"),
+    ("Tornozelo", "Angulação do Tornozelo"),
+    ("Ombro", "Flexão do Ombro"),
+    ("Cotovelo", "Flexão do Cotovelo"),
+    ("Punho", "Flexão do Punho"),
+])
+
+STATUS_FINAIS = ('concluido', 'erro', 'cancelado')
+INTERVALO_EVENTOS_S = 0.25
+KEEPALIVE_EVENTOS_S = 15.0
+TAMANHO_BLOCO_UPLOAD = 1024 * 1024
+
+
+class ConfiguracaoSimulador:
+    """Parâmetros do pipeline sintético e da rede simulada."""
+
+    def __init__(self, latencias: dict = None, variacao: float = 0.0, tamanho_imagem: int = 200_000,
+                 tamanho_video: int = 2_000_000, amostras: int = 900, taxa_falha_job: float = 0.0,
+                 taxa_falha_http: float = 0.0, workers: int = 1, banda_mbps: float = 0.0, minimo: bool = False,
+                 semente: int = None):
+        self.latencias = dict(LATENCIAS_PADRAO, **(latencias or {}))
+        self.variacao = variacao # Variação relativa aleatória de cada latência (0.2 = ±20%)
+        self.tamanho_imagem = tamanho_imagem
+        self.tamanho_video = tamanho_video
+        self.amostras = amostras # Instantes das séries de /dados
+        self.taxa_falha_job = taxa_falha_job # Probabilidade de um job terminar em erro
+        self.taxa_falha_http = taxa_falha_http # Probabilidade de 503 em cada consulta GET
+        self.workers = workers # Jobs processados ao mesmo tempo
+        self.banda_mbps = banda_mbps # Limite de upload (0 = sem limite), como o túnel
+        self.minimo = minimo # Sem upload retomável, /videos, /eventos, /previas nem /dados
+        self.aleatorio = random.Random(semente)
+
+    def latencia(self, etapa: str) -> float:
+        base = self.latencias.get(etapa, 0.0)
+        return max(0.0, base * (1 + self.aleatorio.uniform(-self.variacao, self.variacao)))
+
+    def duracao_media(self) -> float:
+        return sum(self.latencias.values())
+
+
+# ---------------------------------------------------------------
+# Artefatos sintéticos
+# ---------------------------------------------------------------
+def _bloco_png(tipo: bytes, dados: bytes) -> bytes:
+    return struct.pack('>I', len(dados)) + tipo + dados + struct.pack('>I', zlib.crc32(tipo + dados))
+
+
+def png_sintetico(tamanho: int, lado: int = 64) -> bytes:
+    """PNG válido (gradiente em tons de cinza) completado até `tamanho` bytes com um bloco de texto."""
+    linhas = b''.join(b'\x00' + bytes((x + y) * 255 // (2 * lado) for x in range(lado)) for y in range(lado))
+    cabecalho = _bloco_png(b'IHDR', struct.pack('>IIBBBBB', lado, lado, 8, 0, 0, 0, 0))
+    imagem = _bloco_png(b'IDAT', zlib.compress(linhas))
+    fim = _bloco_png(b'IEND', b'')
+    base = b'\x89PNG\r\n\x1a\n' + cabecalho + imagem
+    preenchimento = max(tamanho - len(base) - len(fim) - 12 - len(b'simulado\x00'), 0)
+    return base + _bloco_png(b'tEXt', b'simulado\x00' + b'x' * preenchimento) + fim
+
+
+def _npy(formato: tuple, descricao: str, corpo: bytes) -> bytes:
+    """Arquivo .npy (versão 1.0) com o cabeçalho alinhado em 64 bytes."""
+    cabecalho = "{'descr': '%s', 'fortran_order': False, 'shape': %r, }" % (descricao, tuple(formato))
+    cabecalho += ' ' * ((64 - (10 + len(cabecalho) + 1) % 64) % 64) + '\n'
+    return b'\x93NUMPY\x01\x00' + struct.pack('<H', len(cabecalho)) + cabecalho.encode('latin1') + corpo
+
+
+def _npy_reais(formato: tuple, valores) -> bytes:
+    dados = array.array('f', valores)
+    if sys.byteorder != 'little':
+        dados.byteswap()
+    return _npy(formato, '<f4', dados.tobytes())
+
+
+def _npy_textos(textos) -> bytes:
+    largura = max(len(t) for t in textos)
+    return _npy((len(textos),), f'<U{largura}', b''.join(t.ljust(largura, '\x00').encode('utf-32-le') for t in textos))
+
+
+def npz_sintetico(amostras: int, fps: float = 30.0, inicio_s: float = 0.0) -> bytes:
+    """
+    .npz com os mesmos arrays de /dados do servidor real (ângulos de todas as
+    articulações, fases da marcha, Kalman e eventos), gerados a partir de senoides.
+    """
+    import math
+
+    tempo = [inicio_s + i / fps for i in range(amostras)]
+    ciclo = 1.1 # Duração (s) de um ciclo de marcha
+    arquivos = {
+        'tempo': _npy_reais((amostras,), tempo),
+        'articulacoes': _npy_textos(list(ARTICULACOES)),
+        'titulos': _npy_textos(list(ARTICULACOES.values())),
+        'marcha/tempo': _npy_reais((amostras,), tempo),
+    }
+    for k, articulacao in enumerate(ARTICULACOES):
+        amplitude = 20 + 10 * k
+        valores = []
+        for t in tempo:
+            fase = 2 * math.pi * t / ciclo
+            valores += [amplitude * (1 + math.sin(fase)) / 2, amplitude * (1 + math.sin(fase + math.pi)) / 2]
+        arquivos[f'angulos/{articulacao}'] = _npy_reais((amostras, 2), valores)
+
+    fases = [f(2 * math.pi * t / ciclo + j * math.pi / 2) for t in tempo for f in (math.cos, math.sin) for j in range(4)]
+    arquivos['marcha/fase'] = _npy_reais((amostras, 8), fases)
+    arquivos['marcha/passada'] = _npy_reais((amostras,), [1.2] * amostras)
+    arquivos['kalman/estado'] = _npy_reais((amostras, 2), [v for t in tempo for v in ((t / ciclo) % 1.0, 1 / ciclo)])
+    arquivos['kalman/erros'] = _npy_reais((amostras, 8), [0.05] * (amostras * 8))
+    duracao = amostras / fps
+    for nome, deslocamento in (('contato_direito', 0.0), ('contato_esquerdo', 0.5)):
+        instantes = [inicio_s + (n + deslocamento) * ciclo for n in range(int(duracao / ciclo))]
+        arquivos[f'eventos/{nome}'] = _npy_reais((len(instantes),), instantes)
+
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_DEFLATED) as pacote:
+        for nome, conteudo in arquivos.items():
+            pacote.writestr(nome + '.npy', conteudo)
+    return buffer.getvalue()
+
+
+# ---------------------------------------------------------------
+# Estado do servidor
+# ---------------------------------------------------------------
+class SimuladorBackend:
+    """Jobs, fila, uploads e artefatos do servidor simulado (tudo em memória/tempdir)."""
+
+    def __init__(self, config: ConfiguracaoSimulador):
+        self.config = config
+        self.diretorio = tempfile.mkdtemp(prefix="servidor_simulado_")
+        self.lock = threading.Lock()
+        self.jobs = {}
+        self.artefatos = {} # job_id -> OrderedDict(nome -> bytes)
+        self.cancelamentos = {}
+        self.uploads = {}
+        self.videos = {} # sha256 -> tamanho
+        self.fila = []
+        self.em_execucao = 0
+        self.sinal_fila = threading.Condition(self.lock)
+        self.conteudos = {} # (tipo, tamanho) -> bytes, gerados uma vez
+        for _ in range(config.workers):
+            threading.Thread(target=self._trabalhar, daemon=True).start()
+
+    def conteudo(self, tipo: str, tamanho: int) -> bytes:
+        chave = (tipo, tamanho)
+        if chave not in self.conteudos:
+            self.conteudos[chave] = png_sintetico(tamanho) if tipo == 'imagem' else os.urandom(tamanho)
+        return self.conteudos[chave]
+
+    def atualizar(self, job_id: str, **campos):
+        with self.lock:
+            self.jobs[job_id].update(campos, atualizado_em=time.time())
+
+    def criar_job(self, joint_selection: str, preprocessamento: dict) -> str:
+        job_id = str(uuid.uuid4())
+        with self.lock:
+            self.jobs[job_id] = {'status': 'na_fila', 'resultados': None, 'preprocessamento': preprocessamento,
+                                 'joint_selection': joint_selection, 'atualizado_em': time.time()}
+            self.artefatos[job_id] = OrderedDict()
+            self.cancelamentos[job_id] = threading.Event()
+            self.fila.append(job_id)
+            self.sinal_fila.notify()
+        return job_id
+
+    def posicao(self, job_id: str):
+        with self.lock:
+            return self.fila.index(job_id) + 1 if job_id in self.fila else None
+
+    def descrever(self, job_id: str):
+        """Estado público do job, no mesmo formato do /status real."""
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if job is None:
+                return None
+            job = dict(job, resultados=list(job['resultados']) if job['resultados'] is not None else None)
+            if job['status'] == 'na_fila' and job_id in self.fila:
+                posicao = self.fila.index(job_id) + 1
+                espera = (posicao - 1) // self.config.workers * self.config.duracao_media()
+                job.update(posicao_fila=posicao, inicio_estimado=time.time() + espera, espera_estimada_s=round(espera))
+            return job
+
+    def cancelar(self, job_id: str) -> dict:
+        with self.lock:
+            job = self.jobs[job_id]
+            if job['status'] in STATUS_FINAIS:
+                return {"message": f"O job já está {job['status']}.", "status": job['status']}
+            self.cancelamentos[job_id].set()
+            if job_id in self.fila:
+                self.fila.remove(job_id)
+                job.update(status='cancelado', atualizado_em=time.time())
+                return {"message": "Job removido da fila.", "status": "cancelado"}
+            return {"message": "Sinal de cancelamento enviado.", "status": job['status']}
+
+    def _trabalhar(self):
+        while True:
+            with self.sinal_fila:
+                while not self.fila:
+                    self.sinal_fila.wait()
+                job_id = self.fila.pop(0)
+                self.em_execucao += 1
+            try:
+                self._processar(job_id)
+            finally:
+                with self.lock:
+                    self.em_execucao -= 1
+
+    def _processar(self, job_id: str):
+        """Pipeline sintético: espera cada etapa, publica os artefatos e sorteia as falhas."""
+        config = self.config
+        cancelamento = self.cancelamentos[job_id]
+        job = self.jobs[job_id]
+        base = f"video_{job_id[:8]}"
+        inicio_s = (job.get('preprocessamento') or {}).get('inicio_s', 0.0)
+        etapa_falha = config.aleatorio.choice(list(FAIXAS_PROGRESSO)) if config.aleatorio.random() < config.taxa_falha_job else None
+        tempos = {}
+        self.atualizar(job_id, status='processando', progress=0, resultados=[])
+
+        for etapa, (de, ate) in FAIXAS_PROGRESSO.items():
+            self.atualizar(job_id, etapa=etapa)
+            duracao, inicio = config.latencia(etapa), time.perf_counter()
+            # avança o progresso em passos de 0,1 s, verificando o cancelamento
+            while (decorrido := time.perf_counter() - inicio) < duracao:
+                if cancelamento.wait(min(0.1, duracao - decorrido)):
+                    self.artefatos[job_id].clear()
+                    self.atualizar(job_id, status='cancelado', resultados=None)
+                    return
+                self.atualizar(job_id, progress=max(job.get('progress', 0), int(de + (ate - de) * decorrido / duracao)))
+            tempos[etapa] = round(time.perf_counter() - inicio, 3)
+
+            if etapa == etapa_falha:
+                self.atualizar(job_id, status='erro', error_message=f"Falha simulada na etapa '{etapa}'", tempos=tempos)
+                return
+
+            for etapa_artefato, sufixo, tipo in ARTEFATOS:
+                if etapa_artefato != etapa or (tipo == 'dados' and config.minimo):
+                    continue
+                nome = base + sufixo.format(articulacao=job['joint_selection'].lower())
+                if tipo == 'dados':
+                    conteudo = npz_sintetico(config.amostras, inicio_s=inicio_s)
+                else:
+                    conteudo = self.conteudo(tipo, config.tamanho_imagem if tipo == 'imagem' else config.tamanho_video)
+                self.artefatos[job_id][nome] = conteudo
+                self.atualizar(job_id, resultados=job['resultados'] + [nome])
+            self.atualizar(job_id, progress=ate)
+
+        self.atualizar(job_id, status='concluido', progress=100, tempos=tempos)
+
+    def zip_resultados(self, job_id: str) -> bytes:
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_STORED) as pacote:
+            for nome, conteudo in self.artefatos[job_id].items():
+                pacote.writestr(nome, conteudo)
+        return buffer.getvalue()
+
+
+def intervalo_pedido(request: Request, total: int, etag: str):
+    """Mesma interpretação de Range/If-Range do servidor real: (inicio, fim, status_http)."""
+    intervalo = request.headers.get('Range')
+    if not intervalo or total == 0 or request.headers.get('If-Range', etag) != etag:
+        return 0, total - 1, 200
+    try:
+        unidade, _, faixa = intervalo.partition('=')
+        de, _, ate = faixa.strip().partition('-')
+        if unidade.strip() != 'bytes' or ',' in faixa:
+            raise ValueError
+        if de:
+            inicio, fim = int(de), min(int(ate), total - 1) if ate else total - 1
+            if ate and int(ate) < inicio:
+                raise ValueError
+        else:
+            inicio, fim = max(total - int(ate), 0), total - 1
+    except ValueError:
+        return 0, total - 1, 200
+    if inicio >= total:
+        return inicio, fim, 416
+    return inicio, fim, 206
+
+
+def resposta_com_range(request: Request, conteudo: bytes, media_type: str, nome: str):
+    """Entrega `conteudo` inteiro ou a faixa pedida em Range, com ETag do conteúdo."""
+    total = len(conteudo)
+    etag = '"' + hashlib.sha256(conteudo).hexdigest()[:32] + '"'
+    cabecalhos = {'Accept-Ranges': 'bytes', 'ETag': etag, 'Content-Disposition': f'attachment; filename="{nome}"'}
+    inicio, fim, status_http = intervalo_pedido(request, total, etag)
+    if status_http == 416:
+        return Response(status_code=416, headers={'Content-Range': f'bytes */{total}'})
+    if status_http == 206:
+        cabecalhos['Content-Range'] = f'bytes {inicio}-{fim}/{total}'
+    return Response(content=conteudo[inicio:fim + 1], status_code=status_http, media_type=media_type, headers=cabecalhos)
+
+
+async def limitar_banda(config: ConfiguracaoSimulador, n_bytes: int, inicio: float):
+    """Atrasa a resposta para o envio não passar de `banda_mbps` (como o túnel)."""
+    if config.banda_mbps > 0:
+        restante = n_bytes * 8 / (config.banda_mbps * 1e6) - (time.perf_counter() - inicio)
+        if restante > 0:
+            await asyncio.sleep(restante)
+
+
+# ---------------------------------------------------------------
+# API
+# ---------------------------------------------------------------
+def criar_app(config: ConfiguracaoSimulador) -> FastAPI:
+    """Monta a API simulada com os mesmos endpoints e formatos do server.ipynb."""
+    app = FastAPI(title="Servidor Biomech Simulado")
+    sim = SimuladorBackend(config)
+    app.state.simulador = sim
+
+    @app.middleware("http")
+    async def falhas_transitorias(request: Request, call_next):
+        # 503 só nas consultas (GET), que o cliente repete; o /health nunca falha
+        if request.method == 'GET' and request.url.path != '/health' and config.aleatorio.random() < config.taxa_falha_http:
+            return JSONResponse(status_code=503, content={"detail": "Falha transitória simulada"})
+        return await call_next(request)
+
+    def obter_job(job_id: str):
+        job = sim.descrever(job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail="Job não encontrado")
+        return job
+
+    @app.get("/health")
+    async def health():
+        return {"status": "online", "message": "Servidor Biomech Simulado", "modelos_prontos": True,
+                "fila": len(sim.fila), "em_execucao": sim.em_execucao, "workers": config.workers,
+                "cache": "quente", "cache_armazenamento": "local"}
+
+    @app.post("/processar")
+    async def processar_video(request: Request, file: UploadFile = File(None), joint_selection: str = Form("Joelho"),
+                              prioridade: int = Form(0), upload_id: str = Form(None), preprocessamento: str = Form(None),
+                              hash_video: str = Form(None), nome_arquivo: str = Form(None)):
+        inicio = time.perf_counter()
+        if hash_video and file is None and not upload_id and not config.minimo:
+            if hash_video.lower() not in sim.videos:
+                raise HTTPException(status_code=404, detail="Vídeo não encontrado no servidor: envie o arquivo")
+        elif upload_id and not config.minimo:
+            upload = sim.uploads.get(upload_id)
+            if upload is None:
+                raise HTTPException(status_code=404, detail="Upload não encontrado")
+            if upload['offset'] < upload['tamanho']:
+                raise HTTPException(status_code=409, detail="Upload incompleto")
+            sim.videos[upload['hash'].hexdigest()] = upload['tamanho']
+        elif file is not None:
+            h, tamanho = hashlib.sha256(), 0
+            while bloco := await file.read(TAMANHO_BLOCO_UPLOAD):
+                h.update(bloco)
+                tamanho += len(bloco)
+            await limitar_banda(config, tamanho, inicio)
+            sim.videos[h.hexdigest()] = tamanho
+        else:
+            raise HTTPException(status_code=422, detail="Envie 'file' ou 'upload_id'")
+
+        try:
+            preprocessamento = json.loads(preprocessamento) if preprocessamento else None
+        except ValueError:
+            raise HTTPException(status_code=422, detail="preprocessamento inválido")
+        job_id = sim.criar_job(joint_selection, preprocessamento)
+        return {"message": "Processamento iniciado", "job_id": job_id, "posicao_fila": sim.posicao(job_id)}
+
+    @app.get("/status/{job_id}")
+    async def get_status(job_id: str):
+        return obter_job(job_id)
+
+    @app.post("/cancelar/{job_id}")
+    async def cancelar_job(job_id: str):
+        obter_job(job_id)
+        return sim.cancelar(job_id)
+
+    @app.get("/resultados/{job_id}/{nome_arquivo}")
+    async def get_resultado(job_id: str, nome_arquivo: str, w: int = None):
+        # miniaturas (w) não são simuladas: a imagem vem no tamanho configurado
+        obter_job(job_id)
+        conteudo = sim.artefatos[job_id].get(nome_arquivo)
+        if conteudo is None:
+            raise HTTPException(status_code=404, detail="Arquivo não encontrado")
+        return Response(content=conteudo, media_type='application/octet-stream')
+
+    @app.get("/download-zip/{job_id}")
+    async def download_zip(job_id: str, request: Request):
+        if obter_job(job_id)['status'] != 'concluido':
+            raise HTTPException(status_code=404, detail="Job não concluído ou não encontrado")
+        conteudo = await run_in_threadpool(sim.zip_resultados, job_id)
+        return resposta_com_range(request, conteudo, 'application/zip', f"Resultado_{job_id}.zip")
+
+    if config.minimo:
+        return app
+
+    @app.post("/uploads")
+    async def iniciar_upload(nome_arquivo: str = Form(...), tamanho: int = Form(...)):
+        upload_id = uuid.uuid4().hex
+        sim.uploads[upload_id] = {'nome': nome_arquivo, 'tamanho': tamanho, 'offset': 0,
+                                  'hash': hashlib.sha256(), 'lock': asyncio.Lock()}
+        return {"upload_id": upload_id, "offset": 0}
+
+    @app.get("/uploads/{upload_id}")
+    async def consultar_upload(upload_id: str):
+        upload = sim.uploads.get(upload_id)
+        if upload is None:
+            raise HTTPException(status_code=404, detail="Upload não encontrado")
+        return {"offset": upload['offset'], "tamanho": upload['tamanho'], "concluido": upload['offset'] >= upload['tamanho']}
+
+    @app.put("/uploads/{upload_id}")
+    async def enviar_bloco(upload_id: str, request: Request):
+        upload = sim.uploads.get(upload_id)
+        if upload is None:
+            raise HTTPException(status_code=404, detail="Upload não encontrado")
+        async with upload['lock']:
+            try:
+                offset = int(request.headers['Upload-Offset'])
+            except (KeyError, ValueError):
+                raise HTTPException(status_code=400, detail="Cabeçalho Upload-Offset ausente ou inválido")
+            if offset != upload['offset']:
+                return JSONResponse(status_code=409, content={"offset": upload['offset']})
+            inicio, recebido = time.perf_counter(), 0
+            async for bloco in request.stream():
+                bloco = bloco[:upload['tamanho'] - upload['offset'] - recebido]
+                upload['hash'].update(bloco)
+                recebido += len(bloco)
+            await limitar_banda(config, recebido, inicio)
+            upload['offset'] += recebido
+            if int(request.headers.get('Content-Length', recebido)) > recebido:
+                return JSONResponse(status_code=413, content={"offset": upload['offset'], "detail": "Bloco excede o tamanho declarado do upload"})
+        return {"offset": upload['offset'], "concluido": upload['offset'] >= upload['tamanho']}
+
+    @app.get("/videos/{sha256}")
+    async def consultar_video(sha256: str):
+        tamanho = sim.videos.get(sha256.lower())
+        if tamanho is None:
+            raise HTTPException(status_code=404, detail="Vídeo não encontrado")
+        return {"sha256": sha256.lower(), "tamanho": tamanho}
+
+    @app.get("/eventos/{job_id}")
+    async def eventos_job(job_id: str, request: Request):
+        obter_job(job_id)
+
+        async def gerar():
+            ultimo, ultimo_envio = None, time.time()
+            while not await request.is_disconnected():
+                job = sim.descrever(job_id)
+                estado = json.dumps({k: v for k, v in job.items() if k not in ('inicio_estimado', 'espera_estimada_s')}, default=str)
+                if estado != ultimo:
+                    ultimo, ultimo_envio = estado, time.time()
+                    yield f"event: status\ndata: {json.dumps(job, default=str)}\n\n"
+                    if job['status'] in STATUS_FINAIS:
+                        break
+                elif time.time() - ultimo_envio > KEEPALIVE_EVENTOS_S:
+                    ultimo_envio = time.time()
+                    yield ": keep-alive\n\n"
+                await asyncio.sleep(INTERVALO_EVENTOS_S)
+
+        return StreamingResponse(gerar(), media_type="text/event-stream",
+                                 headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+    @app.get("/previas/{job_id}")
+    async def get_previas(job_id: str, nomes: str, w: int = None):
+        publicados = set(obter_job(job_id).get('resultados') or [])
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_STORED) as pacote:
+            for nome in nomes.split(','):
+                if nome in publicados and nome.lower().endswith(('.png', '.jpg')):
+                    pacote.writestr(nome, sim.artefatos[job_id][nome])
+        return Response(content=buffer.getvalue(), media_type='application/zip')
+
+    @app.get("/dados/{job_id}")
+    async def get_dados(job_id: str, request: Request):
+        nome = next((n for n in obter_job(job_id).get('resultados') or [] if n.endswith('_cinematica.npz')), None)
+        if nome is None:
+            raise HTTPException(status_code=404, detail="Dados numéricos ainda não disponíveis")
+        return resposta_com_range(request, sim.artefatos[job_id][nome], 'application/octet-stream', nome)
+
+    return app
+
+
+def ler_latencias(texto: str) -> dict:
+    """Converte 'deteccao=2,ajuste=3.5' em {'deteccao': 2.0, 'ajuste': 3.5}."""
+    latencias = {}
+    for item in filter(None, (texto or '').split(',')):
+        etapa, _, valor = item.partition('=')
+        if etapa.strip() not in FAIXAS_PROGRESSO:
+            raise argparse.ArgumentTypeError(f"Etapa desconhecida: {etapa} (use {', '.join(FAIXAS_PROGRESSO)})")
+        latencias[etapa.strip()] = float(valor)
+    return latencias
+
+
+def adicionar_argumentos(parser: argparse.ArgumentParser):
+    """Opções do simulador, compartilhadas com o benchmark (que sobe o próprio servidor)."""
+    parser.add_argument('--etapas', type=ler_latencias, default={}, help="Latência (s) por etapa, ex: deteccao=2,ajuste=3")
+    parser.add_argument('--variacao', type=float, default=0.0, help="Variação relativa aleatória das latências (0.2 = ±20%%)")
+    parser.add_argument('--tamanho-imagem', type=int, default=200_000, help="Bytes de cada PNG")
+    parser.add_argument('--tamanho-video', type=int, default=2_000_000, help="Bytes de cada MP4")
+    parser.add_argument('--amostras', type=int, default=900, help="Instantes das séries de /dados")
+    parser.add_argument('--taxa-falha-job', type=float, default=0.0, help="Probabilidade de um job terminar em erro")
+    parser.add_argument('--taxa-falha-http', type=float, default=0.0, help="Probabilidade de 503 em cada consulta GET")
+    parser.add_argument('--workers', type=int, default=1, help="Jobs processados ao mesmo tempo")
+    parser.add_argument('--banda-mbps', type=float, default=0.0, help="Limite de upload em Mbit/s (0 = sem limite)")
+    parser.add_argument('--minimo', action='store_true', help="Só os endpoints básicos (testa os caminhos alternativos do cliente)")
+    parser.add_argument('--semente', type=int, default=None, help="Semente das latências e falhas sorteadas")
+
+
+def configuracao_dos_argumentos(args) -> ConfiguracaoSimulador:
+    return ConfiguracaoSimulador(latencias=args.etapas, variacao=args.variacao, tamanho_imagem=args.tamanho_imagem,
+                                 tamanho_video=args.tamanho_video, amostras=args.amostras,
+                                 taxa_falha_job=args.taxa_falha_job, taxa_falha_http=args.taxa_falha_http,
+                                 workers=args.workers, banda_mbps=args.banda_mbps, minimo=args.minimo, semente=args.semente)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--porta', type=int, default=8000)
+    adicionar_argumentos(parser)
+    args = parser.parse_args()
+    uvicorn.run(criar_app(configuracao_dos_argumentos(args)), host=args.host, port=args.porta, log_level='warning')
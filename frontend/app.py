@@ -2,21 +2,251 @@ import sys
 import os
 import requests
 import requests.exceptions
+import io
 import time
+import json
 import threading
+import zipfile
+import hashlib
+import shutil
+import subprocess
+import tempfile
+import ast
+import struct
+import bisect
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QFileDialog, 
     QTextEdit, QProgressBar, QMessageBox, QLineEdit, QGroupBox, 
-    QRadioButton, QComboBox, QTabWidget, QFrame
+    QRadioButton, QComboBox, QTabWidget, QFrame, QScrollArea, QCheckBox, QDoubleSpinBox
 )
-from PyQt5.QtCore import QTimer, QThread, pyqtSignal, Qt
-from PyQt5.QtGui import QPixmap
+from PyQt5.QtCore import QThread, pyqtSignal, Qt, QPointF, QRectF
+from PyQt5.QtGui import QPixmap, QPainter, QPainterPath, QPen, QColor
 
 diretorio_atual = os.path.dirname(os.path.abspath(__file__))
 diretorio_raiz = os.path.dirname(diretorio_atual)
 sys.path.append(diretorio_raiz)
 
 from script.colab_manager import GerenciadorColab
+from frontend.cliente_api import (ARTICULACOES, criar_sessao_http, EnvioVideo, AcompanhamentoJob, ServidorSemResposta, DownloadZip,
+                                  baixar_retomando, ler_urls_api, consultar_saude, PoolServidores, monitorar_pool, cancelar_job)
+
+class CachePixmaps:
+    """
+    Cache LRU de imagens já decodificadas e escaladas, indexado por (arquivo, largura,
+    altura). Navegar pela galeria ou redimensionar a janela para um tamanho já usado
+    não decodifica nem reescala a imagem de novo; as menos usadas são descartadas.
+    """
+    def __init__(self, capacidade=32):
+        """
+        Args:
+            capacidade (int): Máximo de pixmaps mantidos em memória.
+        """
+        self.capacidade = capacidade
+        self._itens = OrderedDict()
+
+    def obter(self, chave):
+        pixmap = self._itens.get(chave)
+        if pixmap is not None:
+            self._itens.move_to_end(chave)
+        return pixmap
+
+    def guardar(self, chave, pixmap):
+        self._itens[chave] = pixmap
+        self._itens.move_to_end(chave)
+        while len(self._itens) > self.capacidade:
+            self._itens.popitem(last=False)
+
+    def limpar(self):
+        self._itens.clear()
+
+# ===============================================================
+# PRÉ-PROCESSAMENTO DO VÍDEO (ANTES DO ENVIO)
+# ===============================================================
+# Maior lado (px) do vídeo enviado. O servidor reduz os quadros para 960 px antes da
+# detecção, então enviar acima disso só aumenta o tempo de upload pelo túnel.
+RESOLUCOES_ENVIO = OrderedDict([("540p", 960), ("720p", 1280), ("1080p", 1920), ("Original", None)])
+# O servidor analisa no máximo 30 quadros por segundo
+FPS_ENVIO = OrderedDict([("30 fps", 30), ("24 fps", 24), ("Original", None)])
+# Taxa de bits do H.264 reencodado, em bits por pixel de cada quadro
+BITS_POR_PIXEL = 0.1
+
+
+def inspecionar_video(caminho):
+    """
+    Lê com o ffprobe a resolução, a taxa de quadros e a duração do vídeo.
+
+    Args:
+        caminho (str): Caminho local do vídeo.
+
+    Returns:
+        dict: 'largura', 'altura', 'fps', 'duracao_s' e 'tamanho' (bytes), ou None se
+        o ffprobe não estiver instalado ou não reconhecer o arquivo.
+    """
+    if not shutil.which('ffprobe'):
+        return None
+    try:
+        saida = subprocess.run(
+            ['ffprobe', '-v', 'error', '-select_streams', 'v:0', '-of', 'json',
+             '-show_entries', 'stream=width,height,avg_frame_rate:format=duration', caminho],
+            capture_output=True, text=True, timeout=30, check=True).stdout
+        dados = json.loads(saida)
+        fluxo = dados['streams'][0]
+        num, den = fluxo.get('avg_frame_rate', '0/1').split('/')
+        return {
+            'largura': int(fluxo['width']),
+            'altura': int(fluxo['height']),
+            'fps': float(num) / float(den) if float(den) else 30.0,
+            'duracao_s': float(dados['format']['duration']),
+            'tamanho': os.path.getsize(caminho),
+        }
+    except (subprocess.SubprocessError, OSError, KeyError, IndexError, ValueError):
+        return None
+
+
+def parametros_envio(info, opcoes):
+    """
+    Resolve as opções escolhidas na interface contra os dados do vídeo original.
+
+    Args:
+        info (dict): Resultado de inspecionar_video.
+        opcoes (dict): 'lado_max', 'fps', 'inicio_s', 'fim_s' e 'sem_audio'.
+
+    Returns:
+        dict: Opções efetivas (sem ampliar resolução nem fps), com a duração do trecho,
+        a resolução e a taxa de bits de saída.
+    """
+    inicio = max(0.0, min(opcoes.get('inicio_s') or 0.0, info['duracao_s']))
+    fim = opcoes.get('fim_s') or info['duracao_s']
+    fim = min(max(fim, inicio), info['duracao_s'])
+
+    lado_max = opcoes.get('lado_max')
+    escala = min(1.0, lado_max / max(info['largura'], info['altura'])) if lado_max else 1.0
+    fps = opcoes.get('fps')
+    fps = fps if fps and fps < info['fps'] else None
+
+    largura, altura = info['largura'] * escala, info['altura'] * escala
+    taxa_original = info['tamanho'] * 8 / max(info['duracao_s'], 1e-3)
+    taxa = min(largura * altura * (fps or info['fps']) * BITS_POR_PIXEL, taxa_original)
+    return {
+        'inicio_s': round(inicio, 3), 'fim_s': round(fim, 3), 'duracao_s': fim - inicio,
+        'lado_max': lado_max if escala < 1.0 else None, 'fps': fps,
+        'sem_audio': bool(opcoes.get('sem_audio')), 'taxa_bits': int(taxa),
+    }
+
+
+def estimar_tamanho_envio(info, opcoes):
+    """
+    Estima o tamanho (bytes) do vídeo depois do pré-processamento.
+
+    Args:
+        info (dict): Resultado de inspecionar_video.
+        opcoes (dict): Opções escolhidas na interface (ver parametros_envio).
+
+    Returns:
+        int: Tamanho aproximado do arquivo que será enviado.
+    """
+    parametros = parametros_envio(info, opcoes)
+    return int(parametros['taxa_bits'] * parametros['duracao_s'] / 8)
+
+
+def comando_transcodificacao(entrada, saida, parametros):
+    """
+    Monta o comando do ffmpeg que recorta, reduz e reencoda o vídeo para envio.
+
+    Args:
+        entrada (str): Vídeo original.
+        saida (str): Arquivo MP4 de destino.
+        parametros (dict): Resultado de parametros_envio.
+
+    Returns:
+        list: Argumentos do processo ffmpeg (progresso em stdout, formato -progress).
+    """
+    comando = ['ffmpeg', '-y', '-hide_banner', '-loglevel', 'error', '-nostats', '-progress', 'pipe:1']
+    if parametros['inicio_s'] > 0:
+        comando += ['-ss', f"{parametros['inicio_s']:.3f}"]
+    comando += ['-i', entrada, '-t', f"{parametros['duracao_s']:.3f}"]
+
+    filtros = []
+    lado = parametros['lado_max']
+    if lado:
+        # limita o maior lado mantendo a proporção (vale também para vídeos em retrato)
+        filtros.append(f"scale='if(gte(iw,ih),min({lado},iw),-2)':'if(gte(iw,ih),-2,min({lado},ih))'")
+    if parametros['fps']:
+        filtros.append(f"fps={parametros['fps']}")
+    if filtros:
+        comando += ['-vf', ','.join(filtros)]
+
+    taxa = parametros['taxa_bits']
+    comando += ['-c:v', 'libx264', '-preset', 'veryfast', '-pix_fmt', 'yuv420p',
+                '-b:v', str(taxa), '-maxrate', str(int(taxa * 1.5)), '-bufsize', str(taxa * 2)]
+    comando += ['-an'] if parametros['sem_audio'] else ['-c:a', 'aac', '-b:a', '96k']
+    comando += ['-movflags', '+faststart', '-f', 'mp4', saida]
+    return comando
+
+# ===============================================================
+# LEITURA DAS SÉRIES NUMÉRICAS (.npz)
+# ===============================================================
+# Tipos do formato .npy entregues pelo servidor -> código do módulo struct
+CODIGOS_NPY = {'f4': 'f', 'f8': 'd', 'i4': 'i', 'i8': 'q', 'b1': '?'}
+
+def ler_npz(conteudo):
+    """
+    Lê um arquivo .npz sem depender do NumPy (arrays em ordem C de reais, inteiros,
+    booleanos ou texto, como os gravados pelo servidor em /dados).
+
+    Args:
+        conteudo (bytes): Conteúdo do arquivo .npz.
+
+    Returns:
+        dict: {nome: (formato, valores)}, com os valores achatados em uma lista.
+    """
+    arrays = {}
+    with zipfile.ZipFile(io.BytesIO(conteudo)) as pacote:
+        for nome_arquivo in pacote.namelist():
+            dados = pacote.read(nome_arquivo)
+            # Cabeçalho .npy: assinatura (6 bytes), versão (2) e tamanho do dicionário (2 ou 4)
+            if dados[6] == 1:
+                inicio = 10 + struct.unpack('<H', dados[8:10])[0]
+                cabecalho = dados[10:inicio]
+            else:
+                inicio = 12 + struct.unpack('<I', dados[8:12])[0]
+                cabecalho = dados[12:inicio]
+            descricao = ast.literal_eval(cabecalho.decode('latin1'))
+            if descricao['fortran_order']:
+                raise ValueError(f"{nome_arquivo}: ordem Fortran não suportada")
+
+            formato = tuple(descricao['shape'])
+            n = 1
+            for dimensao in formato:
+                n *= dimensao
+            tipo = descricao['descr']
+            ordem = '>' if tipo[0] == '>' else '<'
+            if tipo[1] == 'U':
+                largura = 4 * int(tipo[2:]) # UTF-32, com zeros à direita
+                valores = [dados[inicio + i * largura:inicio + (i + 1) * largura].decode('utf-32-be' if ordem == '>' else 'utf-32-le').rstrip('\x00')
+                           for i in range(n)]
+            else:
+                codigo = f"{ordem}{n}{CODIGOS_NPY[tipo[1:]]}"
+                valores = list(struct.unpack(codigo, dados[inicio:inicio + struct.calcsize(codigo)]))
+            arrays[nome_arquivo[:-len('.npy')]] = (formato, valores)
+    return arrays
+
+def colunas_serie(array):
+    """
+    Separa as colunas de um array lido por ler_npz.
+
+    Args:
+        array (tuple): (formato, valores) de um array 1D ou 2D.
+
+    Returns:
+        list: Uma lista de valores por coluna (uma única para arrays 1D).
+    """
+    formato, valores = array
+    if len(formato) < 2:
+        return [valores]
+    return [valores[j::formato[1]] for j in range(formato[1])]
 
 # ===============================================================
 # WORKER DE INICIALIZAÇÃO (BOOT)
@@ -30,26 +260,23 @@ class WorkerInicializacao(QThread):
     erro = pyqtSignal(str)
     msg_log = pyqtSignal(str)
 
-    def __init__(self, url_notebook, modo_headless):
+    def __init__(self, gerenciador):
         """
         Inicializa o worker.
 
         Args:
-            url_notebook (str): URL do notebook do Google Colab.
-            modo_headless (bool): Se True, roda o navegador sem interface gráfica.
+            gerenciador (GerenciadorColab): Gerenciador mantido pela janela entre os boots,
+                para reaproveitar o navegador e o servidor já no ar.
         """
         super().__init__()
-        self.url_notebook = url_notebook
-        self.modo_headless = modo_headless
-        self.gerenciador = None 
+        self.gerenciador = gerenciador
 
     def run(self):
         """
         Executa a lógica de conexão e inicialização do Colab.
         """
         try:
-            self.msg_log.emit("Iniciando o navegador...")
-            self.gerenciador = GerenciadorColab(self.url_notebook, modo_oculto=self.modo_headless)
+            self.msg_log.emit("Verificando se o servidor já está no ar...")
             msg = self.gerenciador.start_colab()
             self.msg_log.emit(msg[0])
             self.msg_log.emit(msg[1])
@@ -57,17 +284,185 @@ class WorkerInicializacao(QThread):
         except Exception as e:
             self.erro.emit(str(e))
 
+class WorkerSaudeServidor(QThread):
+    """
+    Thread que consulta o /health da API logo após o boot do Colab, até o servidor
+    responder e terminar de carregar os modelos, medindo quanto tempo cada etapa
+    levou. Substitui o teste manual de conexão depois do boot.
+    """
+    online = pyqtSignal(float)
+    pronto = pyqtSignal(dict)
+    erro = pyqtSignal(str)
+
+    INTERVALO = 2 # Segundos entre consultas
+    TEMPO_MAX = 900 # Desiste após 15 minutos sem o servidor ficar pronto
+
+    def __init__(self, url_api):
+        """
+        Inicializa o worker de saúde do servidor.
+
+        Args:
+            url_api (str): URL base da API.
+        """
+        super().__init__()
+        self.url_api = url_api.strip().rstrip('/')
+        self._parar = False
+
+    def parar(self):
+        """Interrompe as consultas."""
+        self._parar = True
+
+    def run(self):
+        """
+        Consulta /health até obter 'modelos_prontos'. Emite `online` (segundos até a
+        primeira resposta) e depois `pronto` com {'api_online': s, 'modelos_prontos': s},
+        mais 'cache' e 'cache_armazenamento' quando o servidor os informa.
+        """
+        inicio = time.time()
+        tempos = {}
+        sessao = criar_sessao_http(conexoes=1, tentativas=0)
+        while not self._parar and time.time() - inicio < self.TEMPO_MAX:
+            try:
+                # Enquanto o túnel não está ativo, o Ngrok responde com uma página de erro (não 200)
+                resposta = sessao.get(f"{self.url_api}/health", timeout=5)
+                if resposta.status_code == 200:
+                    dados = resposta.json()
+                    if 'api_online' not in tempos:
+                        tempos['api_online'] = round(time.time() - inicio, 1)
+                        self.online.emit(tempos['api_online'])
+                    # Servidores antigos não informam o carregamento dos modelos
+                    if dados.get('modelos_prontos', True):
+                        tempos['modelos_prontos'] = round(time.time() - inicio, 1)
+                        tempos.update({k: dados[k] for k in ('cache', 'cache_armazenamento') if k in dados})
+                        self.pronto.emit(tempos)
+                        return
+            except (requests.exceptions.RequestException, ValueError):
+                pass
+            time.sleep(self.INTERVALO)
+
+        if not self._parar:
+            self.erro.emit(f"O servidor não ficou pronto em {self.TEMPO_MAX // 60} minutos.")
+
+# ===============================================================
+# POOL DE SERVIDORES (VÁRIOS RUNTIMES)
+# ===============================================================
+class WorkerMonitorServidores(QThread):
+    """
+    Thread que consulta o /health de todos os servidores do pool em paralelo, a cada
+    poucos segundos, mantendo a carga atualizada e avisando quando algum cai ou volta.
+    """
+    estado_alterado = pyqtSignal(str, bool) # URL, online
+
+    INTERVALO = 5 # Segundos entre rodadas de consultas
+
+    def __init__(self, pool):
+        """
+        Inicializa o monitor.
+
+        Args:
+            pool (PoolServidores): Pool a manter atualizado.
+        """
+        super().__init__()
+        self.pool = pool
+        self._parar = threading.Event()
+
+    def parar(self):
+        """Interrompe as consultas."""
+        self._parar.set()
+
+    def run(self):
+        """Consulta os servidores até `parar()`, emitindo `estado_alterado` a cada transição."""
+        monitorar_pool(self.pool, self._parar, self.estado_alterado.emit, self.INTERVALO)
+
+# ===============================================================
+# WORKER DE PRÉ-PROCESSAMENTO
+# ===============================================================
+class WorkerTranscodificacao(QThread):
+    """
+    Thread que recorta, reduz e reencoda o vídeo com o ffmpeg antes do upload.
+    O resultado fica na pasta temporária com um nome derivado do vídeo e das opções,
+    então repetir o envio com as mesmas opções reaproveita o arquivo já gerado (e o
+    upload retomável continua de onde parou).
+    """
+    finalizado = pyqtSignal(str, dict)
+    erro = pyqtSignal(str)
+    progresso = pyqtSignal(int)
+
+    def __init__(self, caminho_video, info, opcoes):
+        """
+        Inicializa o worker de pré-processamento.
+
+        Args:
+            caminho_video (str): Caminho local do vídeo original.
+            info (dict): Dados do vídeo original (inspecionar_video).
+            opcoes (dict): Opções escolhidas na interface (ver parametros_envio).
+        """
+        super().__init__()
+        self.caminho_video = caminho_video
+        self.info = info
+        self.parametros = parametros_envio(info, opcoes)
+        self._processo = None
+        self._parar = False
+
+    def parar(self):
+        """Interrompe o ffmpeg em andamento."""
+        self._parar = True
+        if self._processo is not None:
+            self._processo.kill()
+
+    def run(self):
+        """
+        Executa o ffmpeg acompanhando o progresso e emite o caminho do vídeo gerado
+        junto com a descrição do pré-processamento (enviada ao servidor).
+        """
+        try:
+            preprocessamento = {k: v for k, v in self.parametros.items() if k not in ('duracao_s', 'taxa_bits')}
+            preprocessamento['original'] = self.info
+
+            chave = json.dumps([os.path.abspath(self.caminho_video), os.path.getmtime(self.caminho_video), self.parametros])
+            nome = os.path.splitext(os.path.basename(self.caminho_video))[0]
+            saida = os.path.join(tempfile.gettempdir(), f"{nome}_envio_{hashlib.sha1(chave.encode()).hexdigest()[:12]}.mp4")
+            if os.path.exists(saida):
+                self.progresso.emit(100)
+                self.finalizado.emit(saida, preprocessamento)
+                return
+
+            parcial = saida + '.parcial'
+            self._processo = subprocess.Popen(comando_transcodificacao(self.caminho_video, parcial, self.parametros),
+                                              stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+            duracao_us = max(self.parametros['duracao_s'], 1e-3) * 1e6
+            for linha in self._processo.stdout:
+                # o ffmpeg informa out_time_us (e out_time_ms, também em microssegundos)
+                if linha.startswith('out_time_us=') and linha.strip().split('=')[1].isdigit():
+                    self.progresso.emit(min(99, int(100 * int(linha.strip().split('=')[1]) / duracao_us)))
+            erros = self._processo.stderr.read()
+            if self._processo.wait() != 0:
+                if os.path.exists(parcial):
+                    os.remove(parcial)
+                if self._parar:
+                    return
+                raise RuntimeError(f"ffmpeg falhou: {erros.strip()[-300:]}")
+
+            os.replace(parcial, saida)
+            self.progresso.emit(100)
+            self.finalizado.emit(saida, preprocessamento)
+        except Exception as e:
+            self.erro.emit(str(e))
+
 # ===============================================================
 # WORKER DE UPLOAD
 # ===============================================================
 class WorkerUpload(QThread):
     """
-    Thread responsável por enviar o vídeo e configurações para a API.
+    Thread responsável por enviar o vídeo e configurações para a API (ver
+    `EnvioVideo`: deduplicação pelo SHA-256 e upload retomável em blocos).
     """
     finalizado = pyqtSignal(dict)
     erro = pyqtSignal(str)
+    progresso = pyqtSignal(int)
+    msg_log = pyqtSignal(str)
 
-    def __init__(self, url_api, caminho_video, selecao_articulacao):
+    def __init__(self, url_api, caminho_video, selecao_articulacao, preprocessamento=None, sessao=None):
         """
         Inicializa o worker de upload.
 
@@ -75,43 +470,77 @@ class WorkerUpload(QThread):
             url_api (str): URL base da API (ex: Ngrok).
             caminho_video (str): Caminho local do arquivo de vídeo.
             selecao_articulacao (str): Nome da articulação selecionada.
+            preprocessamento (dict): Recorte/redução aplicados ao vídeo antes do envio,
+                repassados ao servidor para corrigir os tempos (None = vídeo original).
+            sessao (requests.Session): Sessão compartilhada (keep-alive entre os blocos).
         """
         super().__init__()
-        self.url_api = url_api
-        self.caminho_video = caminho_video
-        self.selecao_articulacao = selecao_articulacao 
+        self.envio = EnvioVideo(url_api, caminho_video, selecao_articulacao, preprocessamento,
+                                ao_progresso=self.progresso.emit, ao_log=self.msg_log.emit, sessao=sessao)
 
     def run(self):
         """
-        Envia o arquivo e dados via POST para o endpoint /processar.
+        Envia o vídeo (se o servidor ainda não o tiver) e dispara o processamento.
         """
         try:
-            url_limpa = self.url_api.strip().rstrip('/')
-            url = f"{url_limpa}/processar"
-            
-            carga_dados = {'joint_selection': self.selecao_articulacao}
-            
-            with open(self.caminho_video, 'rb') as f:
-                arquivos = {'file': (os.path.basename(self.caminho_video), f, 'video/mp4')}
-                resposta = requests.post(url, files=arquivos, data=carga_dados, timeout=120)
-            
-            resposta.raise_for_status()
-            self.finalizado.emit(resposta.json())
+            self.finalizado.emit(self.envio.executar())
         except Exception as e:
             self.erro.emit(str(e))
 
+# ===============================================================
+# WORKER DE ACOMPANHAMENTO DO JOB
+# ===============================================================
+class WorkerEventos(QThread):
+    """
+    Thread que acompanha o job pelo stream de eventos (/eventos) da API, recebendo
+    cada mudança de etapa e progresso assim que acontece, sem bloquear a interface
+    (ver `AcompanhamentoJob`; sem o stream, consulta /status periodicamente).
+    """
+    status_recebido = pyqtSignal(dict)
+    erro = pyqtSignal(str)
+
+    def __init__(self, url_api, id_tarefa):
+        """
+        Inicializa o worker de eventos.
+
+        Args:
+            url_api (str): URL base da API.
+            id_tarefa (str): ID do job a acompanhar.
+        """
+        super().__init__()
+        self.acompanhamento = AcompanhamentoJob(url_api, id_tarefa, self.status_recebido.emit)
+
+    def parar(self):
+        """Encerra o acompanhamento (fecha o stream aberto, se houver)."""
+        self.acompanhamento.parar()
+
+    def run(self):
+        """
+        Acompanha o job até um status final, reconectando com espera crescente
+        quando a conexão cai.
+        """
+        try:
+            self.acompanhamento.executar()
+        except ServidorSemResposta as e:
+            self.erro.emit(str(e))
+
 # ===============================================================
 # WORKER PARA BAIXAR IMAGENS
 # ===============================================================
 class WorkerPrevia(QThread):
     """
     Thread responsável por baixar as imagens resultantes processadas pela API
-    para exibição na galeria.
+    para exibição na galeria. Pede todas as imagens em um único pacote quando o
+    servidor oferece /previas; senão baixa as imagens em paralelo.
     """
     imagem_baixada = pyqtSignal(str, bytes) # Nome arquivo, dados binários
+    erro = pyqtSignal(str)
     finalizado = pyqtSignal()
 
-    def __init__(self, url_api, id_tarefa, lista_imagens):
+    DOWNLOADS_PARALELOS = 4
+    TIMEOUT = (10, 60) # Segundos para conectar e para cada leitura
+
+    def __init__(self, url_api, id_tarefa, lista_imagens, sessao=None, largura=None):
         """
         Inicializa o worker de prévia.
 
@@ -119,27 +548,334 @@ class WorkerPrevia(QThread):
             url_api (str): URL base da API.
             id_tarefa (str): ID do job processado.
             lista_imagens (list): Lista de nomes de arquivos de imagem.
+            sessao (requests.Session): Sessão compartilhada (criada se omitida).
+            largura (int): Se informada, pede miniaturas com no máximo essa largura
+                em pixels em vez das imagens em resolução original.
         """
         super().__init__()
         self.url_api = url_api
         self.id_tarefa = id_tarefa
         self.lista_imagens = lista_imagens
+        self.sessao = sessao or criar_sessao_http()
+        self.parametros = {'w': largura} if largura else {}
 
     def run(self):
         """
-        Itera sobre a lista de imagens e realiza o download de cada uma.
+        Baixa as imagens da lista e as emite na ordem da lista.
         """
-        for nome_img in self.lista_imagens:
-            if nome_img.endswith('.png') or nome_img.endswith('.jpg'):
+        imagens = [n for n in self.lista_imagens if n.endswith('.png') or n.endswith('.jpg')]
+
+        if len(imagens) > 1:
+            try:
+                recebidas = self._baixar_pacote(imagens)
+            except Exception as e:
+                self.erro.emit(f"Pacote de imagens: {e}")
+                recebidas = None
+            if recebidas is not None:
+                for nome in imagens:
+                    if nome in recebidas:
+                        self.imagem_baixada.emit(nome, recebidas[nome])
+                imagens = [n for n in imagens if n not in recebidas]
+
+        with ThreadPoolExecutor(max_workers=self.DOWNLOADS_PARALELOS) as executor:
+            futuros = [(nome, executor.submit(self._baixar_imagem, nome)) for nome in imagens]
+            for nome, futuro in futuros:
                 try:
-                    url = f"{self.url_api}/resultados/{self.id_tarefa}/{nome_img}"
-                    r = requests.get(url)
-                    if r.status_code == 200:
-                        self.imagem_baixada.emit(nome_img, r.content)
-                except:
-                    pass
+                    self.imagem_baixada.emit(nome, futuro.result())
+                except Exception as e:
+                    self.erro.emit(f"{nome}: {e}")
         self.finalizado.emit()
 
+    def _baixar_pacote(self, imagens):
+        """
+        Baixa as imagens em um único ZIP pelo endpoint /previas.
+
+        Returns:
+            dict: {nome: bytes} das imagens recebidas, ou None se o servidor não
+            tiver o endpoint.
+        """
+        url = f"{self.url_api}/previas/{self.id_tarefa}"
+        r = self.sessao.get(url, params={'nomes': ','.join(imagens), **self.parametros}, timeout=self.TIMEOUT)
+        if r.status_code in (404, 405):
+            return None
+        r.raise_for_status()
+        with zipfile.ZipFile(io.BytesIO(r.content)) as pacote:
+            return {nome: pacote.read(nome) for nome in pacote.namelist()}
+
+    def _baixar_imagem(self, nome_img):
+        url = f"{self.url_api}/resultados/{self.id_tarefa}/{nome_img}"
+        r = self.sessao.get(url, params=self.parametros, timeout=self.TIMEOUT)
+        r.raise_for_status()
+        return r.content
+
+# ===============================================================
+# WORKER PARA BAIXAR AS SÉRIES NUMÉRICAS
+# ===============================================================
+class WorkerDados(QThread):
+    """
+    Thread que baixa as séries numéricas do job (/dados, um .npz de poucos KB) para
+    o gráfico interativo. Se a conexão cair, continua do último byte recebido (Range).
+    """
+    dados_recebidos = pyqtSignal(dict, int) # Arrays lidos, tamanho baixado em bytes
+    erro = pyqtSignal(str)
+
+    MAX_TENTATIVAS = 3
+
+    def __init__(self, url_api, id_tarefa, sessao=None):
+        """
+        Inicializa o worker de dados.
+
+        Args:
+            url_api (str): URL base da API.
+            id_tarefa (str): ID do job processado.
+            sessao (requests.Session): Sessão compartilhada (criada se omitida).
+        """
+        super().__init__()
+        self.url = f"{url_api}/dados/{id_tarefa}"
+        self.sessao = sessao or criar_sessao_http()
+
+    def run(self):
+        """
+        Baixa o .npz, retomando após falhas de conexão, e emite os arrays lidos.
+        """
+        try:
+            buffer = io.BytesIO()
+            baixar_retomando(self.sessao, self.url, buffer, max_tentativas=self.MAX_TENTATIVAS, tamanho_bloco=64 * 1024)
+            conteudo = buffer.getvalue()
+            self.dados_recebidos.emit(ler_npz(conteudo), len(conteudo))
+        except Exception as e:
+            self.erro.emit(str(e))
+
+# ===============================================================
+# WORKER PARA BAIXAR O ZIP DOS RESULTADOS
+# ===============================================================
+class WorkerDownload(QThread):
+    """
+    Thread responsável por baixar o ZIP com todos os resultados, emitindo o progresso.
+    O arquivo é gravado em '<destino>.part' e, se a conexão cair, o download continua
+    do último byte recebido (HTTP Range), inclusive em um novo clique no botão
+    (ver `DownloadZip`).
+    """
+    finalizado = pyqtSignal(str)
+    erro = pyqtSignal(str)
+    progresso = pyqtSignal(int)
+
+    def __init__(self, url_api, id_tarefa, caminho_destino, sessao=None):
+        """
+        Inicializa o worker de download.
+
+        Args:
+            url_api (str): URL base da API.
+            id_tarefa (str): ID do job processado.
+            caminho_destino (str): Caminho local onde o ZIP será salvo.
+            sessao (requests.Session): Sessão compartilhada (criada se omitida).
+        """
+        super().__init__()
+        self.download = DownloadZip(url_api, id_tarefa, caminho_destino, sessao, ao_progresso=self.progresso.emit)
+
+    def run(self):
+        """
+        Baixa o ZIP em fluxo, retomando após falhas de conexão.
+        """
+        try:
+            self.finalizado.emit(self.download.executar())
+        except Exception as e:
+            self.erro.emit(str(e))
+
+# ===============================================================
+# JANELA DE IMAGEM EM RESOLUÇÃO ORIGINAL
+# ===============================================================
+class JanelaImagem(QScrollArea):
+    """
+    Janela independente que exibe uma imagem em resolução original, com barras
+    de rolagem quando ela for maior que a tela.
+    """
+    def __init__(self, nome, dados):
+        """
+        Args:
+            nome (str): Nome do arquivo (usado como título).
+            dados (bytes): Conteúdo binário da imagem.
+        """
+        super().__init__()
+        self.setWindowTitle(nome)
+        pixmap = QPixmap()
+        pixmap.loadFromData(dados)
+        rotulo = QLabel()
+        rotulo.setPixmap(pixmap)
+        self.setWidget(rotulo)
+        self.resize(min(pixmap.width() + 20, 1400), min(pixmap.height() + 20, 900))
+
+# ===============================================================
+# GRÁFICO INTERATIVO DAS SÉRIES
+# ===============================================================
+class GraficoSeries(QWidget):
+    """
+    Gráfico de linhas desenhado com QPainter a partir das séries numéricas do job.
+    A roda do mouse aproxima/afasta no eixo do tempo, arrastar desloca a janela e o
+    clique duplo volta à visão completa. O eixo Y se ajusta às amostras visíveis.
+    """
+    CORES = ['#4dabf7', '#ff6b6b', '#51cf66', '#ffa94d', '#b197fc', '#63e6be', '#f783ac', '#adb5bd']
+    MARGENS = (60, 30, 20, 48) # Esquerda, topo, direita, base (px)
+    DIVISOES = 5 # Divisões da grade em cada eixo
+    LARGURA_MIN = 0.05 # Menor janela de tempo (s) ao aproximar
+
+    def __init__(self):
+        """Inicializa o gráfico vazio."""
+        super().__init__()
+        self.setMinimumSize(400, 300)
+        self.tempo = []
+        self.series = [] # [(rótulo, valores)], alinhadas a self.tempo
+        self.eventos = [] # [(rótulo, instantes)], desenhados como linhas verticais
+        self.titulo = ""
+        self.rotulo_y = ""
+        self.janela = (0.0, 1.0) # Intervalo de tempo visível
+        self.arraste = None # (x do mouse, janela) no início do arraste
+
+    def definir_series(self, tempo, series, titulo="", rotulo_y="", eventos=None, manter_janela=False):
+        """
+        Troca as séries exibidas.
+
+        Args:
+            tempo (list): Instantes (s) das amostras, em ordem crescente.
+            series (list): Pares (rótulo, valores) com o mesmo tamanho de `tempo`.
+            titulo (str): Título do gráfico.
+            rotulo_y (str): Rótulo do eixo Y.
+            eventos (list): Pares (rótulo, instantes) de eventos da marcha.
+            manter_janela (bool): Mantém o zoom atual (ex: troca de articulação).
+        """
+        self.tempo = tempo
+        self.series = series
+        self.titulo = titulo
+        self.rotulo_y = rotulo_y
+        self.eventos = eventos or []
+        if not manter_janela:
+            self.janela = self._extensao()
+        self._definir_janela(*self.janela)
+
+    def _extensao(self):
+        """Intervalo de tempo completo das séries."""
+        if len(self.tempo) > 1 and self.tempo[-1] > self.tempo[0]:
+            return (self.tempo[0], self.tempo[-1])
+        return (0.0, 1.0)
+
+    def _definir_janela(self, inicio, fim):
+        """Aplica a janela de tempo, limitada à extensão das séries."""
+        limite_inicio, limite_fim = self._extensao()
+        largura = max(min(fim - inicio, limite_fim - limite_inicio), min(self.LARGURA_MIN, limite_fim - limite_inicio))
+        inicio = min(max(inicio, limite_inicio), limite_fim - largura)
+        self.janela = (inicio, inicio + largura)
+        self.update()
+
+    def _area(self):
+        esquerda, topo, direita, base = self.MARGENS
+        return QRectF(esquerda, topo, self.width() - esquerda - direita, self.height() - topo - base)
+
+    def paintEvent(self, evento):
+        """Desenha grade, eventos, séries e legenda da janela de tempo atual."""
+        pintor = QPainter(self)
+        pintor.setRenderHint(QPainter.Antialiasing)
+        pintor.fillRect(self.rect(), QColor('#202020'))
+        area = self._area()
+        if not self.series or area.width() <= 0 or area.height() <= 0:
+            pintor.setPen(QColor('#888'))
+            pintor.drawText(self.rect(), Qt.AlignCenter, "Aguardando dados...")
+            return
+
+        # Amostras visíveis (mais uma de cada lado, para as linhas chegarem às bordas)
+        t0, t1 = self.janela
+        i0 = max(bisect.bisect_left(self.tempo, t0) - 1, 0)
+        i1 = min(bisect.bisect_right(self.tempo, t1) + 1, len(self.tempo))
+        # Mais amostras que pixels: desenha uma a cada `passo`
+        passo = max((i1 - i0) // max(int(area.width()), 1), 1)
+
+        visiveis = [v for _, valores in self.series for v in valores[i0:i1] if v == v] # v == v descarta NaN
+        y0, y1 = (min(visiveis), max(visiveis)) if visiveis else (0.0, 1.0)
+        if y1 - y0 < 1e-9:
+            y0, y1 = y0 - 1, y1 + 1
+        folga = 0.05 * (y1 - y0)
+        y0, y1 = y0 - folga, y1 + folga
+
+        x_de = lambda t: area.left() + (t - t0) / (t1 - t0) * area.width()
+        y_de = lambda v: area.bottom() - (v - y0) / (y1 - y0) * area.height()
+
+        # Grade e marcas dos eixos
+        for k in range(self.DIVISOES + 1):
+            t = t0 + (t1 - t0) * k / self.DIVISOES
+            v = y0 + (y1 - y0) * k / self.DIVISOES
+            pintor.setPen(QPen(QColor('#3a3a3a'), 1, Qt.DotLine))
+            pintor.drawLine(QPointF(x_de(t), area.top()), QPointF(x_de(t), area.bottom()))
+            pintor.drawLine(QPointF(area.left(), y_de(v)), QPointF(area.right(), y_de(v)))
+            pintor.setPen(QColor('#aaa'))
+            pintor.drawText(QRectF(x_de(t) - 40, area.bottom() + 4, 80, 18), Qt.AlignCenter, f"{t:.2f}")
+            pintor.drawText(QRectF(0, y_de(v) - 8, area.left() - 6, 16), Qt.AlignRight | Qt.AlignVCenter, f"{v:.1f}")
+
+        pintor.drawText(QRectF(area.left(), area.bottom() + 26, area.width(), 18), Qt.AlignCenter, "Tempo (s)")
+        pintor.drawText(QRectF(area.left(), 4, area.width(), 20), Qt.AlignCenter, f"{self.titulo}  [{self.rotulo_y}]")
+
+        pintor.setClipRect(area)
+        # Eventos da marcha
+        for indice, (_, instantes) in enumerate(self.eventos):
+            pintor.setPen(QPen(QColor(self.CORES[-1 - indice % len(self.CORES)]), 1, Qt.DashLine))
+            for t in instantes:
+                if t0 <= t <= t1:
+                    pintor.drawLine(QPointF(x_de(t), area.top()), QPointF(x_de(t), area.bottom()))
+
+        # Séries (NaN interrompe a linha)
+        for indice, (_, valores) in enumerate(self.series):
+            caminho = QPainterPath()
+            aberto = False
+            for i in range(i0, i1, passo):
+                v = valores[i]
+                if v != v:
+                    aberto = False
+                    continue
+                ponto = QPointF(x_de(self.tempo[i]), y_de(v))
+                if aberto:
+                    caminho.lineTo(ponto)
+                else:
+                    caminho.moveTo(ponto)
+                    aberto = True
+            pintor.setPen(QPen(QColor(self.CORES[indice % len(self.CORES)]), 1.5))
+            pintor.drawPath(caminho)
+        pintor.setClipping(False)
+
+        # Legenda
+        for indice, (rotulo, _) in enumerate(self.series):
+            y = area.top() + 6 + 20 * indice
+            pintor.setPen(QPen(QColor(self.CORES[indice % len(self.CORES)]), 3))
+            pintor.drawLine(QPointF(area.right() - 150, y + 10), QPointF(area.right() - 130, y + 10))
+            pintor.setPen(QColor('#ddd'))
+            pintor.drawText(QRectF(area.right() - 124, y, 122, 20), Qt.AlignLeft | Qt.AlignVCenter, rotulo)
+
+    def wheelEvent(self, evento):
+        """Aproxima (roda para frente) ou afasta o eixo do tempo em torno do cursor."""
+        if not self.series:
+            return
+        area = self._area()
+        t0, t1 = self.janela
+        fracao = min(max((evento.pos().x() - area.left()) / max(area.width(), 1), 0.0), 1.0)
+        centro = t0 + fracao * (t1 - t0)
+        fator = 0.8 if evento.angleDelta().y() > 0 else 1.25
+        self._definir_janela(centro - (centro - t0) * fator, centro + (t1 - centro) * fator)
+
+    def mousePressEvent(self, evento):
+        if evento.button() == Qt.LeftButton:
+            self.arraste = (evento.pos().x(), self.janela)
+
+    def mouseMoveEvent(self, evento):
+        if self.arraste is None:
+            return
+        x_inicial, (t0, t1) = self.arraste
+        deslocamento = (evento.pos().x() - x_inicial) / max(self._area().width(), 1) * (t1 - t0)
+        self._definir_janela(t0 - deslocamento, t1 - deslocamento)
+
+    def mouseReleaseEvent(self, evento):
+        self.arraste = None
+
+    def mouseDoubleClickEvent(self, evento):
+        """Volta à visão completa."""
+        self._definir_janela(*self._extensao())
+
 # ===============================================================
 # CLASSE PRINCIPAL DA APLICAÇÃO
 # ===============================================================
@@ -148,20 +884,62 @@ class AppBiomecanica(QWidget):
     Janela principal da aplicação de Análise Biomecânica.
     Gerencia a interface do usuário, conexões de sinais e fluxo de trabalho.
     """
+    # Nomes exibidos no log para as etapas informadas pelo servidor
+    NOMES_ETAPAS = {
+        'deteccao': "Detecção das poses",
+        'ajuste': "Ajuste do modelo cinemático",
+        'marcha': "Análise da marcha",
+        'renderizacao': "Gerando gráficos e vídeos",
+    }
+
+    # Gráficos renderizados pelo servidor que o app desenha a partir de /dados:
+    # ficam só no ZIP, sem download para a galeria
+    MARCADORES_GRAFICOS_NATIVOS = ('_03_angulo_', '_04_fase_marcha', '_05_erro_kalman', '_06_estado_kalman')
+
+    # Séries do gráfico interativo: nome -> (array de tempo, array de valores, eixo Y, legenda).
+    # Os ângulos usam o array da articulação escolhida ('angulos/<articulação>').
+    SERIES_GRAFICO = OrderedDict([
+        ("Ângulos das articulações", ('tempo', None, "graus", None)),
+        ("Fase da marcha", ('marcha/tempo', 'marcha/fase', "cos / sen", "Fase")),
+        ("Passada", ('marcha/tempo', 'marcha/passada', "passada", "Passada")),
+        ("Estado do filtro de Kalman", ('marcha/tempo', 'kalman/estado', "estado", "Estado")),
+        ("Erro do filtro de Kalman", ('marcha/tempo', 'kalman/erros', "erro", "Erro")),
+    ])
+
+    MAX_REENVIOS = 2 # Reenvios de um mesmo job a outro servidor quando o atual cai
+
     def __init__(self):
         super().__init__()
         self.caminho_video = None
+        self.info_video = None # Resolução, fps e duração do vídeo selecionado (ffprobe)
+        self.transcodificador = None
         self.id_tarefa = None
-        self.url_base_api = "" 
+        self.url_base_api = "" # Servidor do job atual (com vários, o escolhido pelo pool)
+        self.pool_servidores = None
+        self.worker_monitor = None
+        self.envio_atual = None # (vídeo, pré-processamento, articulação) do job atual, para reenviá-lo
+        self.job_em_andamento = False
+        self.reenvios = 0
         self.URL_NOTEBOOK = "https://colab.research.google.com/drive/1OddXt5nuWqXRdmrmQs7LBWJ3a6_OdiuK"
         self.estado_status = False
+        self.posicao_fila = None
+        self.etapa_atual = None
 
         # Variáveis da Galeria (Carrossel)
-        self.dados_galeria = [] # Lista de tuplas: (nome_arquivo, dados_bytes)
+        self.dados_galeria = [] # Lista de tuplas: (nome_arquivo, bytes da miniatura)
         self.indice_img_atual = 0
-        
-        self.temporizador = QTimer(self)
-        self.temporizador.timeout.connect(self.verificar_status)
+        self.cache_pixmaps = CachePixmaps()
+        self.janelas_imagem = [] # Janelas de resolução original abertas
+        self.imagens_solicitadas = set() # Imagens do job atual já enviadas para download
+        self.workers_previa = []
+        self.worker_eventos = None
+        self.worker_saude = None
+        self.worker_dados = None
+        self.dados_cinematica = None # Arrays de /dados do job atual (ver ler_npz)
+        self.dados_solicitados = False
+        self.tempo_grafico = None # Array de tempo do gráfico exibido (mantém o zoom entre séries)
+        self.gerenciador_colab = None # Mantido entre boots para reaproveitar navegador e servidor
+        self.sessao_http = criar_sessao_http() # Conexões keep-alive reaproveitadas pelos uploads e downloads
         
         self.configurar_interface()
 
@@ -196,7 +974,7 @@ class AppBiomecanica(QWidget):
         # 1. CONEXÃO
         grupo_conexao = QGroupBox("1. Conexão API")
         layout_conexao = QVBoxLayout()
-        self.input_url = QLineEdit(); self.input_url.setPlaceholderText("URL do Túnel Ngrok, Cloudflare...")
+        self.input_url = QLineEdit(); self.input_url.setPlaceholderText("URL do Túnel Ngrok, Cloudflare... (várias separadas por vírgula)")
         self.input_url.setText("https://toucan-glorious-fowl.ngrok-free.app")
         layout_conexao.addWidget(QLabel("URL:")); layout_conexao.addWidget(self.input_url)
         
@@ -217,10 +995,44 @@ class AppBiomecanica(QWidget):
         self.btn_selecionar.clicked.connect(self.selecionar_video)
         self.lbl_arquivo = QLabel("...")
         self.combo_articulacoes = QComboBox()
-        self.combo_articulacoes.addItems(["Joelho", "Quadril", "Tornozelo", "Ombro", "Cotovelo", "Punho"])
+        self.combo_articulacoes.addItems(list(ARTICULACOES))
         
         layout_arquivo.addWidget(self.btn_selecionar); layout_arquivo.addWidget(self.lbl_arquivo)
         layout_arquivo.addWidget(QLabel("Articulação:")); layout_arquivo.addWidget(self.combo_articulacoes)
+
+        # Pré-processamento opcional (ffmpeg) para encurtar o envio pelo túnel
+        self.chk_otimizar = QCheckBox("Reduzir o vídeo antes do envio")
+        self.chk_otimizar.toggled.connect(self.atualizar_estimativa_envio)
+        self.painel_otimizacao = QFrame()
+        layout_otimizacao = QVBoxLayout(self.painel_otimizacao)
+        layout_otimizacao.setContentsMargins(0, 0, 0, 0)
+
+        self.combo_resolucao = QComboBox(); self.combo_resolucao.addItems(list(RESOLUCOES_ENVIO))
+        self.combo_fps = QComboBox(); self.combo_fps.addItems(list(FPS_ENVIO))
+        linha_reducao = QHBoxLayout()
+        linha_reducao.addWidget(self.combo_resolucao); linha_reducao.addWidget(self.combo_fps)
+        layout_otimizacao.addLayout(linha_reducao)
+
+        self.spin_inicio = QDoubleSpinBox(); self.spin_inicio.setSuffix(" s"); self.spin_inicio.setDecimals(1)
+        self.spin_fim = QDoubleSpinBox(); self.spin_fim.setSuffix(" s"); self.spin_fim.setDecimals(1)
+        linha_recorte = QHBoxLayout()
+        linha_recorte.addWidget(QLabel("De")); linha_recorte.addWidget(self.spin_inicio)
+        linha_recorte.addWidget(QLabel("até")); linha_recorte.addWidget(self.spin_fim)
+        layout_otimizacao.addLayout(linha_recorte)
+
+        self.chk_sem_audio = QCheckBox("Remover áudio"); self.chk_sem_audio.setChecked(True)
+        self.lbl_estimativa = QLabel(""); self.lbl_estimativa.setWordWrap(True)
+        layout_otimizacao.addWidget(self.chk_sem_audio); layout_otimizacao.addWidget(self.lbl_estimativa)
+
+        for combo in (self.combo_resolucao, self.combo_fps):
+            combo.currentIndexChanged.connect(self.atualizar_estimativa_envio)
+        for spin in (self.spin_inicio, self.spin_fim):
+            spin.valueChanged.connect(self.atualizar_estimativa_envio)
+        self.chk_sem_audio.toggled.connect(self.atualizar_estimativa_envio)
+
+        self.painel_otimizacao.setEnabled(False)
+        self.chk_otimizar.setEnabled(False)
+        layout_arquivo.addWidget(self.chk_otimizar); layout_arquivo.addWidget(self.painel_otimizacao)
         grupo_arquivo.setLayout(layout_arquivo)
         layout_esquerdo.addWidget(grupo_arquivo)
 
@@ -294,13 +1106,42 @@ class AppBiomecanica(QWidget):
         self.btn_proximo.clicked.connect(self.proxima_imagem)
         self.btn_proximo.setEnabled(False)
 
+        self.btn_original = QPushButton("🔍 Resolução Original")
+        self.btn_original.clicked.connect(self.abrir_resolucao_original)
+        self.btn_original.setEnabled(False)
+
         layout_controles.addWidget(self.btn_anterior)
         layout_controles.addWidget(self.lbl_info_img)
         layout_controles.addWidget(self.btn_proximo)
+        layout_controles.addWidget(self.btn_original)
         
         self.layout_vis.addLayout(layout_controles)
         painel_direito.addTab(self.aba_visualizador, "Galeria / Gráficos")
 
+        # Aba 3: Gráficos interativos (séries numéricas de /dados, desenhadas localmente)
+        self.aba_graficos = QWidget()
+        layout_graficos = QVBoxLayout(self.aba_graficos)
+
+        layout_selecao = QHBoxLayout()
+        self.combo_serie = QComboBox()
+        self.combo_serie.addItems(list(self.SERIES_GRAFICO))
+        self.combo_serie.currentIndexChanged.connect(self.atualizar_grafico)
+        self.combo_articulacao_grafico = QComboBox()
+        self.combo_articulacao_grafico.currentIndexChanged.connect(self.atualizar_grafico)
+        self.lbl_dados = QLabel("Sem dados")
+        self.lbl_dados.setStyleSheet("color: gray;")
+        layout_selecao.addWidget(self.combo_serie)
+        layout_selecao.addWidget(self.combo_articulacao_grafico)
+        layout_selecao.addWidget(self.lbl_dados)
+        layout_graficos.addLayout(layout_selecao)
+
+        self.grafico = GraficoSeries()
+        layout_graficos.addWidget(self.grafico, stretch=1)
+        lbl_dica = QLabel("Roda do mouse: zoom no tempo  |  Arrastar: mover  |  Clique duplo: visão completa")
+        lbl_dica.setStyleSheet("color: gray; font-size: 11px;")
+        layout_graficos.addWidget(lbl_dica)
+        painel_direito.addTab(self.aba_graficos, "Gráficos Interativos")
+
         # Montagem Final
         layout_principal.addWidget(painel_esquerdo)
         layout_principal.addWidget(painel_direito)
@@ -316,24 +1157,60 @@ class AppBiomecanica(QWidget):
             self.lbl_info_img.setText("0 / 0")
             self.btn_anterior.setEnabled(False)
             self.btn_proximo.setEnabled(False)
+            self.btn_original.setEnabled(False)
             return
 
         nome, img_bytes = self.dados_galeria[self.indice_img_atual]
-        
-        # Carrega a imagem a partir dos bytes
-        pixmap = QPixmap()
-        pixmap.loadFromData(img_bytes)
-        
-        # Escala mantendo proporção (usa o tamanho atual do label como base)
+
+        # Escala mantendo proporção (usa o tamanho atual do label como base),
+        # reaproveitando do cache a imagem já decodificada e/ou já escalada
         w, h = self.lbl_exibicao.width(), self.lbl_exibicao.height()
-        pixmap_escalado = pixmap.scaled(w, h, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-        
+        pixmap_escalado = self.cache_pixmaps.obter((nome, w, h))
+        if pixmap_escalado is None:
+            pixmap = self.cache_pixmaps.obter((nome, 0, 0))
+            if pixmap is None:
+                pixmap = QPixmap()
+                pixmap.loadFromData(img_bytes)
+                self.cache_pixmaps.guardar((nome, 0, 0), pixmap)
+            pixmap_escalado = pixmap.scaled(w, h, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+            self.cache_pixmaps.guardar((nome, w, h), pixmap_escalado)
+
         self.lbl_exibicao.setPixmap(pixmap_escalado)
         self.lbl_info_img.setText(f"{self.indice_img_atual + 1} / {len(self.dados_galeria)}\n{nome}")
 
         # Atualiza estado dos botões de navegação
         self.btn_anterior.setEnabled(self.indice_img_atual > 0)
         self.btn_proximo.setEnabled(self.indice_img_atual < len(self.dados_galeria) - 1)
+        self.btn_original.setEnabled(True)
+
+    def abrir_resolucao_original(self):
+        """
+        Baixa sob demanda a imagem atual em resolução original e a abre em uma janela
+        própria (a galeria guarda apenas miniaturas).
+        """
+        if not self.dados_galeria:
+            return
+        nome = self.dados_galeria[self.indice_img_atual][0]
+        self.registrar_log(f"Baixando {nome} em resolução original...")
+
+        worker = WorkerPrevia(self.url_base_api, self.id_tarefa, [nome], self.sessao_http)
+        worker.imagem_baixada.connect(self.mostrar_resolucao_original)
+        worker.erro.connect(lambda e: self.registrar_log(f"Falha ao baixar imagem: {e}"))
+        worker.finalizado.connect(lambda w=worker: self.workers_previa.remove(w))
+        self.workers_previa.append(worker)
+        worker.start()
+
+    def mostrar_resolucao_original(self, nome, dados):
+        """Abre a imagem recebida em resolução original em uma nova janela."""
+        janela = JanelaImagem(nome, dados)
+        janela.destroyed.connect(lambda _=None, j=janela: self.janelas_imagem.remove(j) if j in self.janelas_imagem else None)
+        janela.setAttribute(Qt.WA_DeleteOnClose)
+        self.janelas_imagem.append(janela)
+        janela.show()
+
+    def largura_miniatura(self):
+        """Largura (px físicos) das miniaturas pedidas ao servidor para a galeria."""
+        return int(max(self.lbl_exibicao.width(), 800) * self.devicePixelRatioF())
 
     def proxima_imagem(self):
         """Avança para a próxima imagem da galeria."""
@@ -378,6 +1255,10 @@ class AppBiomecanica(QWidget):
         """Reseta a galeria de imagens e os contadores."""
         self.dados_galeria = []
         self.indice_img_atual = 0
+        self.imagens_solicitadas = set()
+        self.dados_solicitados = False
+        self.cache_pixmaps.limpar()
+        self.btn_original.setEnabled(False)
         self.lbl_exibicao.clear()
         self.lbl_exibicao.setText("Processando...")
         self.lbl_info_img.setText("0 / 0")
@@ -405,27 +1286,130 @@ class AppBiomecanica(QWidget):
     # --- CONEXÃO E BOOT ---
     def testar_conexao(self):
         """
-        Verifica se a URL da API informada está respondendo (ping/health check).
+        Verifica se as URLs da API informadas (uma ou várias) estão respondendo
+        (ping/health check) e passa a acompanhá-las em segundo plano.
         """
-        url = self.input_url.text().strip()
-        if not url.startswith("http"): return QMessageBox.warning(self, "Erro", "Use http/https")
-        self.url_base_api = url.rstrip('/')
+        urls = ler_urls_api(self.input_url.text())
+        if not urls: return QMessageBox.warning(self, "Erro", "Use http/https")
         self.definir_luz_status("yellow")
-        try:
-            if requests.get(f"{self.url_base_api}/health", timeout=3).status_code == 200:
-                self.definir_luz_status("green"); self.registrar_log("Conectado!")
-                self.estado_status = True
-                #self.btn_iniciar.setEnabled(True)
-            else: self.definir_luz_status("red"); self.estado_status = False; self.registrar_log(f"Sem conexão com o Servidor!")
-        except: self.definir_luz_status("red"); self.registrar_log("Falha conexão")
+        with ThreadPoolExecutor(max_workers=len(urls)) as executor:
+            saudes = list(executor.map(consultar_saude, urls))
+        self.configurar_pool(urls, saudes)
+
+        online = self.pool_servidores.online()
+        if not online: self.registrar_log("Sem conexão com o Servidor!")
+        elif len(urls) == 1: self.registrar_log("Conectado!")
+        else: self.registrar_log(f"Conectado a {len(online)} de {len(urls)} servidores.")
+
+    def configurar_pool(self, urls, saudes=None):
+        """
+        Troca o pool de servidores e reinicia o monitor de saúde em segundo plano.
+
+        Args:
+            urls (list): URLs base das APIs.
+            saudes (list): Respostas do /health já obtidas para cada URL (None = ainda não consultadas).
+        """
+        if self.worker_monitor is not None:
+            self.worker_monitor.parar()
+        self.pool_servidores = PoolServidores(urls)
+        if saudes is not None:
+            for url, saude in zip(urls, saudes):
+                self.pool_servidores.atualizar(url, saude)
+            self.atualizar_luz_pool()
+        if not self.job_em_andamento:
+            self.url_base_api = urls[0]
+
+        self.worker_monitor = WorkerMonitorServidores(self.pool_servidores)
+        self.worker_monitor.estado_alterado.connect(self.ao_mudar_estado_servidor)
+        self.worker_monitor.start()
+
+    def atualizar_luz_pool(self):
+        """Luz verde com todos os servidores online, amarela com parte deles e vermelha com nenhum."""
+        online, total = len(self.pool_servidores.online()), len(self.pool_servidores.urls)
+        self.estado_status = online > 0
+        self.definir_luz_status("green" if online == total else "yellow" if online else "red")
+
+    def ao_mudar_estado_servidor(self, url, online):
+        """
+        Callback do monitor quando um servidor cai ou volta. Se for o servidor do job
+        em andamento que caiu, o job é reenviado a outro.
+
+        Args:
+            url (str): Servidor que mudou de estado.
+            online (bool): Novo estado.
+        """
+        if online:
+            self.registrar_log(f"Servidor online: {url} ({self.pool_servidores.descrever(url)})")
+        else:
+            self.registrar_log(f"Servidor offline: {url}")
+        self.atualizar_luz_pool()
+        if not online and url == self.url_base_api:
+            self.reenviar_job(f"o servidor {url} parou de responder")
 
     def iniciar_processo_boot(self):
         """Inicia a thread que abre o navegador e prepara o Colab."""
         #self.registrar_log("Iniciando Boot...")
-        self.worker_inicializacao = WorkerInicializacao(self.URL_NOTEBOOK, self.rb_auto.isChecked())
+        if self.gerenciador_colab is None:
+            self.gerenciador_colab = GerenciadorColab(self.URL_NOTEBOOK)
+        # Com a URL da API informada, um servidor que já responde é reaproveitado sem reexecutar o notebook
+        # (com várias URLs, o notebook ligado aqui é o da primeira)
+        urls = ler_urls_api(self.input_url.text())
+        self.gerenciador_colab.url_api = urls[0] if urls else None
+        self.gerenciador_colab.modo_oculto = self.rb_auto.isChecked()
+
+        self.worker_inicializacao = WorkerInicializacao(self.gerenciador_colab)
         self.worker_inicializacao.msg_log.connect(self.registrar_log)
+        self.worker_inicializacao.iniciado_ok.connect(self.aguardar_servidor)
+        self.worker_inicializacao.erro.connect(lambda e: self.registrar_log(f"Erro no boot: {e}"))
         self.worker_inicializacao.start()
 
+    def aguardar_servidor(self):
+        """
+        Após o boot do Colab, acompanha o /health da URL informada em segundo plano e
+        acende a luz de status sozinho quando a API responder. As demais URLs, se
+        houver, entram no pool de servidores junto com ela.
+        """
+        urls = ler_urls_api(self.input_url.text())
+        if not urls:
+            return
+        if self.worker_saude is not None:
+            self.worker_saude.parar()
+        self.configurar_pool(urls)
+        self.definir_luz_status("yellow")
+
+        self.worker_saude = WorkerSaudeServidor(urls[0])
+        self.worker_saude.online.connect(self.ao_servidor_online)
+        self.worker_saude.pronto.connect(self.ao_servidor_pronto)
+        self.worker_saude.erro.connect(lambda e: (self.definir_luz_status("red"), self.registrar_log(e)))
+        self.worker_saude.start()
+
+    def ao_servidor_online(self, segundos):
+        """
+        Callback da primeira resposta do /health: a API já aceita vídeos (os jobs
+        esperam na fila até os modelos terminarem de carregar).
+
+        Args:
+            segundos (float): Tempo desde o fim do boot do Colab.
+        """
+        self.definir_luz_status("green")
+        self.estado_status = True
+        self.registrar_log(f"Conectado! API online {segundos:.0f}s após o boot; carregando os modelos...")
+
+    def ao_servidor_pronto(self, tempos):
+        """
+        Callback do servidor pronto (modelos carregados).
+
+        Args:
+            tempos (dict): Segundos até 'api_online' e 'modelos_prontos', contados do fim do boot,
+                e o estado do cache persistente ('cache' e 'cache_armazenamento'), se informado.
+        """
+        self.registrar_log(f"Servidor pronto: API online em {tempos['api_online']:.0f}s, "
+                           f"modelos carregados em {tempos['modelos_prontos']:.0f}s.")
+        if 'cache' in tempos:
+            self.registrar_log(f"Cache do servidor: {tempos['cache']} ({tempos.get('cache_armazenamento', '?')}).")
+            if tempos['cache'] == 'frio' and tempos.get('cache_armazenamento') == 'local':
+                self.registrar_log("Dica: monte o Google Drive no runtime uma vez para o cache sobreviver à troca de máquina (ver backend/README.md).")
+
     # --- FLUXO PRINCIPAL ---
     def selecionar_video(self):
         """Abre caixa de diálogo para seleção do arquivo de vídeo local."""
@@ -433,12 +1417,57 @@ class AppBiomecanica(QWidget):
         if caminho:
             self.caminho_video = caminho
             self.lbl_arquivo.setText(os.path.basename(caminho))
+
+            # Dados do vídeo para o pré-processamento (requer ffmpeg/ffprobe instalados)
+            self.info_video = inspecionar_video(caminho)
+            self.chk_otimizar.setEnabled(self.info_video is not None)
+            if self.info_video is None:
+                self.chk_otimizar.setChecked(False)
+                self.chk_otimizar.setToolTip("Requer o ffmpeg (e ffprobe) instalado no PATH.")
+            else:
+                i = self.info_video
+                self.lbl_arquivo.setText(f"{os.path.basename(caminho)}\n{i['largura']}x{i['altura']}, "
+                                         f"{i['fps']:.0f} fps, {i['duracao_s']:.1f} s, {i['tamanho'] / 1e6:.1f} MB")
+                for spin in (self.spin_inicio, self.spin_fim):
+                    spin.setMaximum(i['duracao_s'])
+                self.spin_inicio.setValue(0.0)
+                self.spin_fim.setValue(i['duracao_s'])
+            self.atualizar_estimativa_envio()
             # Habilita botão de início se a conexão já estiver OK (luz verde)
             #if "green" in self.luz_status.styleSheet(): self.btn_iniciar.setEnabled(True)
 
+    def opcoes_envio(self):
+        """
+        Opções de pré-processamento escolhidas na interface.
+
+        Returns:
+            dict: 'lado_max', 'fps', 'inicio_s', 'fim_s' e 'sem_audio'.
+        """
+        return {
+            'lado_max': RESOLUCOES_ENVIO[self.combo_resolucao.currentText()],
+            'fps': FPS_ENVIO[self.combo_fps.currentText()],
+            'inicio_s': self.spin_inicio.value(),
+            'fim_s': self.spin_fim.value(),
+            'sem_audio': self.chk_sem_audio.isChecked(),
+        }
+
+    def atualizar_estimativa_envio(self):
+        """Mostra o tamanho estimado do vídeo pré-processado e a economia no envio."""
+        otimizar = self.chk_otimizar.isChecked() and self.info_video is not None
+        self.painel_otimizacao.setEnabled(otimizar)
+        if not otimizar:
+            self.lbl_estimativa.setText("")
+            return
+        original = self.info_video['tamanho']
+        estimado = estimar_tamanho_envio(self.info_video, self.opcoes_envio())
+        economia = 100 * (1 - estimado / original) if original else 0
+        self.lbl_estimativa.setText(f"Envio estimado: ~{estimado / 1e6:.1f} MB "
+                                    f"(original {original / 1e6:.1f} MB, {economia:.0f}% menor)")
+
     def iniciar_analise(self):
         """
-        Prepara a interface e inicia a thread de Upload.
+        Prepara a interface e inicia a thread de Upload (antes, a de pré-processamento,
+        se a redução do vídeo estiver marcada).
         """
         if self.estado_status:
             if not self.caminho_video:
@@ -448,20 +1477,155 @@ class AppBiomecanica(QWidget):
                 self.btn_cancelar.setEnabled(True)
                 self.barra_progresso.setValue(0)
                 self.limpar_galeria()
-            
-                self.registrar_log("Enviando o vídeo para processamento...")
-                self.uploader = WorkerUpload(self.url_base_api, self.caminho_video, self.combo_articulacoes.currentText())
-                self.uploader.finalizado.connect(self.ao_concluir_upload)
-                self.uploader.erro.connect(lambda e: self.registrar_log(f"Erro Upload: {e}"))
-                self.uploader.start()
+                self.reenvios = 0
+
+                if self.chk_otimizar.isChecked() and self.info_video is not None:
+                    self.registrar_log("Reduzindo o vídeo antes do envio...")
+                    self.transcodificador = WorkerTranscodificacao(self.caminho_video, self.info_video, self.opcoes_envio())
+                    self.transcodificador.progresso.connect(self.barra_progresso.setValue)
+                    self.transcodificador.finalizado.connect(self.ao_concluir_transcodificacao)
+                    self.transcodificador.erro.connect(self.ao_falhar_transcodificacao)
+                    self.transcodificador.start()
+                else:
+                    self.enviar_video(self.caminho_video)
         else:
             self.registrar_log(f"Sem conexão com o Servidor!")
+
+    def ao_concluir_transcodificacao(self, caminho, preprocessamento):
+        """
+        Callback do pré-processamento: envia o vídeo reduzido.
+
+        Args:
+            caminho (str): Vídeo gerado pelo ffmpeg.
+            preprocessamento (dict): Parâmetros aplicados, repassados ao servidor.
+        """
+        tamanho = os.path.getsize(caminho)
+        self.registrar_log(f"Vídeo reduzido: {tamanho / 1e6:.1f} MB (original {self.info_video['tamanho'] / 1e6:.1f} MB)")
+        self.enviar_video(caminho, preprocessamento)
+
+    def ao_falhar_transcodificacao(self, mensagem):
+        """Callback de erro do pré-processamento: libera a interface para nova tentativa."""
+        self.registrar_log(f"Erro ao reduzir o vídeo: {mensagem}")
+        self.btn_iniciar.setEnabled(True)
+        self.btn_cancelar.setEnabled(False)
+
+    def enviar_video(self, caminho, preprocessamento=None, articulacao=None, url=None):
+        """
+        Inicia a thread de upload do vídeo para o servidor menos carregado do pool.
+
+        Args:
+            caminho (str): Vídeo a enviar (original ou pré-processado).
+            preprocessamento (dict): Parâmetros do pré-processamento, se houve.
+            articulacao (str): Articulação do job (None = a selecionada na interface).
+            url (str): Servidor já escolhido (ex: num reenvio); None = escolhe pelo pool.
+        """
+        if articulacao is None:
+            articulacao = self.combo_articulacoes.currentText()
+        if url is None and self.pool_servidores is not None:
+            # Sem servidor online no pool (ex: recém-ligado), tenta o último usado
+            url = self.pool_servidores.escolher()
+        if url is not None:
+            self.url_base_api = url
+        self.envio_atual = (caminho, preprocessamento, articulacao)
+        self.job_em_andamento = True
+
+        if self.pool_servidores is not None and len(self.pool_servidores.urls) > 1:
+            self.registrar_log(f"Servidor escolhido: {self.url_base_api} ({self.pool_servidores.descrever(self.url_base_api)})")
+        self.registrar_log("Enviando o vídeo para processamento...")
+        self.barra_progresso.setValue(0)
+        self.uploader = WorkerUpload(self.url_base_api, caminho, articulacao, preprocessamento, self.sessao_http)
+        self.uploader.finalizado.connect(self.ao_concluir_upload)
+        self.uploader.progresso.connect(self.barra_progresso.setValue)
+        self.uploader.erro.connect(self.ao_falhar_upload)
+        self.uploader.msg_log.connect(self.registrar_log)
+        self.uploader.start()
+
+    def servidor_do_job_offline(self):
+        """
+        Returns:
+            bool: True se o monitor considera offline o servidor do job atual.
+        """
+        return self.pool_servidores is not None and self.url_base_api not in self.pool_servidores.online()
+
+    def reenviar_job(self, motivo):
+        """
+        Reenvia o job em andamento (o mesmo vídeo e articulação) ao servidor menos
+        carregado entre os demais do pool, descartando o acompanhamento do atual.
+
+        Args:
+            motivo (str): Motivo registrado no log.
+
+        Returns:
+            bool: True se o job foi reenviado; False sem job em andamento, sem outro
+            servidor online ou após MAX_REENVIOS.
+        """
+        if not self.job_em_andamento or self.envio_atual is None or self.pool_servidores is None:
+            return False
+        if self.reenvios >= self.MAX_REENVIOS:
+            self.registrar_log(f"Job não reenviado ({motivo}): limite de {self.MAX_REENVIOS} reenvios atingido.")
+            return False
+        url_antiga, id_antigo = self.url_base_api, self.id_tarefa
+        url = self.pool_servidores.escolher(excluir=(url_antiga,))
+        if url is None:
+            self.registrar_log(f"Job não reenviado ({motivo}): nenhum outro servidor online.")
+            return False
+
+        self.reenvios += 1
+        self.registrar_log(f"Reenviando o job para {url}: {motivo}.")
+        if self.worker_eventos is not None:
+            self.worker_eventos.parar()
+        if id_antigo:
+            # Se o servidor antigo voltar, o job duplicado não ocupa a fila dele
+            threading.Thread(target=self._enviar_pedido_cancelamento, args=(url_antiga, id_antigo), daemon=True).start()
+        self.id_tarefa = None
+        self.limpar_galeria()
+        self.enviar_video(*self.envio_atual, url=url)
+        return True
+
+    def finalizar_job_com_erro(self):
+        """Libera a interface para uma nova tentativa depois de uma falha sem reenvio."""
+        self.job_em_andamento = False
+        self.btn_iniciar.setEnabled(True)
+        self.btn_cancelar.setEnabled(False)
+
+    def ao_falhar_upload(self, mensagem):
+        """
+        Callback de erro do upload: reenvia o job se o servidor caiu, senão encerra.
+
+        Args:
+            mensagem (str): Erro informado pelo WorkerUpload.
+        """
+        if self.sender() is not self.uploader:
+            return # upload de um servidor já abandonado por um reenvio
+        self.registrar_log(f"Erro Upload: {mensagem}")
+        if not (self.servidor_do_job_offline() and self.reenviar_job("falha no envio")):
+            self.finalizar_job_com_erro()
+
+    def ao_falhar_eventos(self, mensagem):
+        """
+        Callback de erro do acompanhamento do job: reenvia o job se o servidor caiu.
+
+        Args:
+            mensagem (str): Erro informado pelo WorkerEventos.
+        """
+        if self.sender() is not self.worker_eventos:
+            return
+        self.registrar_log(f"ERRO: {mensagem}")
+        if not (self.servidor_do_job_offline() and self.reenviar_job("sem resposta do servidor")):
+            self.finalizar_job_com_erro()
         
     
     def cancelar_analise(self):
         """
         Solicita confirmação e envia sinal de parada para o servidor.
         """
+        if self.transcodificador is not None and self.transcodificador.isRunning():
+            # ainda não há job no servidor: basta interromper o ffmpeg
+            self.transcodificador.parar()
+            self.registrar_log("Redução do vídeo interrompida.")
+            self.btn_iniciar.setEnabled(True)
+            self.btn_cancelar.setEnabled(False)
+            return
         if not self.id_tarefa: return
         
         resposta = QMessageBox.question(self, 'Confirmar', 
@@ -471,14 +1635,20 @@ class AppBiomecanica(QWidget):
         if resposta == QMessageBox.Yes:
             self.registrar_log("Solicitando cancelamento...")
             self.btn_cancelar.setEnabled(False)
+            self.job_em_andamento = False # um job cancelado não é reenviado se o servidor cair
             
             threading.Thread(target=self._enviar_pedido_cancelamento).start()
 
-    def _enviar_pedido_cancelamento(self):
-        """Envia requisição HTTP POST para cancelar o job atual."""
+    def _enviar_pedido_cancelamento(self, url_api=None, id_tarefa=None):
+        """
+        Envia requisição HTTP POST para cancelar um job.
+
+        Args:
+            url_api (str): Servidor do job (None = o do job atual).
+            id_tarefa (str): Job a cancelar (None = o job atual).
+        """
         try:
-            url = f"{self.url_base_api}/cancelar/{self.id_tarefa}"
-            requests.post(url, timeout=5)
+            cancelar_job(url_api or self.url_base_api, id_tarefa or self.id_tarefa)
         except Exception as e:
             print(f"Erro ao cancelar: {e}")
 
@@ -487,71 +1657,183 @@ class AppBiomecanica(QWidget):
         Callback executado quando o upload termina com sucesso.
         Inicia o timer de verificação de status.
         """
+        if self.sender() is not self.uploader:
+            return # upload de um servidor já abandonado por um reenvio
         self.id_tarefa = dados.get('job_id')
+        self.posicao_fila = None
+        self.etapa_atual = None
         self.registrar_log(f"Upload OK! (Processo {self.id_tarefa}). Aguardando...")
-        self.temporizador.start(3000)
 
-    def verificar_status(self):
+        if self.worker_eventos is not None:
+            self.worker_eventos.parar()
+        self.worker_eventos = WorkerEventos(self.url_base_api, self.id_tarefa)
+        self.worker_eventos.status_recebido.connect(self.atualizar_status)
+        self.worker_eventos.erro.connect(self.ao_falhar_eventos)
+        self.worker_eventos.start()
+
+    def atualizar_status(self, d):
         """
-        Consulta periodicamente (polling) o status do processamento na API.
-        Gerencia os estados: processando, cancelado, concluido, erro.
+        Atualiza a interface com o status do job recebido pelo WorkerEventos.
+        Gerencia os estados: na_fila, processando, cancelado, concluido, erro.
+
+        Args:
+            d (dict): Status do job, no formato retornado por /status.
         """
-        try:
-            r = requests.get(f"{self.url_base_api}/status/{self.id_tarefa}", timeout=5)
-            if r.status_code == 200:
-                d = r.json()
-                status, progresso = d.get('status'), d.get('progress', 0)
-                
-                if status == 'processando':
-                    self.barra_progresso.setValue(progresso)
-
-                elif status == 'cancelado':
-                    self.temporizador.stop()
-                    self.registrar_log(">>> Processamento CANCELADO pelo usuário.")
-                    self.barra_progresso.setValue(0)
-                    self.btn_iniciar.setEnabled(True)
-                    self.btn_cancelar.setEnabled(False)
-                    self.lbl_exibicao.setText("Cancelado.")
-                    QMessageBox.warning(self, "Cancelado", "O processamento foi interrompido.")
-                
-                elif status == 'concluido':
-                    self.barra_progresso.setValue(100)
-                    self.temporizador.stop()
-                    self.registrar_log("Finalizado!")
-                    self.btn_baixar.setEnabled(True)
-                    self.iniciar_download_preview(d.get('resultados', []))
-                    QMessageBox.information(self, "Sucesso", "Análise pronta! Veja a aba Galeria.")
-                    self.btn_cancelar.setEnabled(False)
-                
-                elif status == 'erro':
-                    self.temporizador.stop(); self.registrar_log(f"ERRO: {d.get('error_message')}")
-                    self.btn_cancelar.setEnabled(False)
-        except: pass
+        status, progresso = d.get('status'), d.get('progress', 0)
+
+        if status == 'na_fila':
+            # Só registra quando a posição muda, para não poluir o log
+            posicao = d.get('posicao_fila')
+            if posicao != self.posicao_fila:
+                self.posicao_fila = posicao
+                espera = d.get('espera_estimada_s') or 0
+                self.registrar_log(f"Na fila do servidor: posição {posicao} (início em ~{max(1, round(espera / 60))} min)")
+
+        elif status == 'processando':
+            self.barra_progresso.setValue(progresso)
+            etapa = d.get('etapa')
+            if etapa and etapa != self.etapa_atual:
+                self.etapa_atual = etapa
+                self.registrar_log(f"Etapa: {self.NOMES_ETAPAS.get(etapa, etapa)}")
+            # Os gráficos são publicados assim que ficam prontos (antes dos vídeos)
+            self.iniciar_download_preview(d.get('resultados') or [])
+            self.iniciar_download_dados(d.get('resultados') or [])
+
+        elif status == 'cancelado':
+            self.job_em_andamento = False
+            self.registrar_log(">>> Processamento CANCELADO pelo usuário.")
+            self.barra_progresso.setValue(0)
+            self.btn_iniciar.setEnabled(True)
+            self.btn_cancelar.setEnabled(False)
+            self.lbl_exibicao.setText("Cancelado.")
+            QMessageBox.warning(self, "Cancelado", "O processamento foi interrompido.")
+
+        elif status == 'concluido':
+            self.job_em_andamento = False
+            self.barra_progresso.setValue(100)
+            self.registrar_log("Finalizado!")
+            self.btn_baixar.setEnabled(True)
+            self.iniciar_download_preview(d.get('resultados', []))
+            self.iniciar_download_dados(d.get('resultados', []))
+            QMessageBox.information(self, "Sucesso", "Análise pronta! Veja a aba Galeria.")
+            self.btn_cancelar.setEnabled(False)
+
+        elif status == 'erro':
+            self.job_em_andamento = False
+            self.registrar_log(f"ERRO: {d.get('error_message')}")
+            self.btn_cancelar.setEnabled(False)
 
     def iniciar_download_preview(self, lista_arquivos):
         """
-        Inicia a thread para baixar as imagens de prévia.
+        Inicia uma thread para baixar as imagens de prévia ainda não solicitadas.
+        Pode ser chamado a cada consulta de status: só as imagens novas são baixadas.
         
         Args:
             lista_arquivos (list): Lista de nomes de arquivos retornada pela API.
         """
-        self.registrar_log("Baixando imagens...")
-        self.worker_previa = WorkerPrevia(self.url_base_api, self.id_tarefa, lista_arquivos)
-        self.worker_previa.imagem_baixada.connect(self.adicionar_imagem_galeria)
-        self.worker_previa.start()
+        novas = [n for n in lista_arquivos if n.endswith(('.png', '.jpg')) and n not in self.imagens_solicitadas
+                 and not any(m in n for m in self.MARCADORES_GRAFICOS_NATIVOS)]
+        if not novas:
+            return
+        self.imagens_solicitadas.update(novas)
+        self.registrar_log(f"Baixando {len(novas)} imagem(ns)...")
+
+        worker = WorkerPrevia(self.url_base_api, self.id_tarefa, novas, self.sessao_http, largura=self.largura_miniatura())
+        worker.imagem_baixada.connect(self.adicionar_imagem_galeria)
+        worker.erro.connect(lambda e: self.registrar_log(f"Falha ao baixar imagem: {e}"))
+        worker.finalizado.connect(lambda w=worker: self.workers_previa.remove(w))
+        self.workers_previa.append(worker) # Mantém a referência enquanto a thread roda
+        worker.start()
+
+    def iniciar_download_dados(self, lista_arquivos):
+        """
+        Baixa as séries numéricas do job (uma vez) assim que o servidor as publica.
+
+        Args:
+            lista_arquivos (list): Lista de nomes de arquivos retornada pela API.
+        """
+        if self.dados_solicitados or not any(n.endswith('_cinematica.npz') for n in lista_arquivos):
+            return
+        self.dados_solicitados = True
+        self.worker_dados = WorkerDados(self.url_base_api, self.id_tarefa, self.sessao_http)
+        self.worker_dados.dados_recebidos.connect(self.ao_receber_dados)
+        self.worker_dados.erro.connect(lambda e: self.registrar_log(f"Falha ao baixar os dados numéricos: {e}"))
+        self.worker_dados.start()
+
+    def ao_receber_dados(self, arrays, tamanho):
+        """
+        Callback das séries numéricas baixadas: preenche as articulações disponíveis
+        (todas, não só a analisada) e desenha o gráfico.
+
+        Args:
+            arrays (dict): Arrays lidos do .npz (ver ler_npz).
+            tamanho (int): Tamanho baixado em bytes.
+        """
+        self.dados_cinematica = arrays
+        self.tempo_grafico = None
+        self.lbl_dados.setText(f"{tamanho / 1024:.0f} KB de dados")
+        self.registrar_log(f"Dados numéricos recebidos ({tamanho / 1024:.0f} KB). Veja a aba Gráficos Interativos.")
+
+        articulacoes = arrays.get('articulacoes', ((0,), []))[1]
+        self.combo_articulacao_grafico.blockSignals(True)
+        self.combo_articulacao_grafico.clear()
+        self.combo_articulacao_grafico.addItems(articulacoes)
+        if self.combo_articulacoes.currentText() in articulacoes:
+            self.combo_articulacao_grafico.setCurrentText(self.combo_articulacoes.currentText())
+        self.combo_articulacao_grafico.blockSignals(False)
+        self.atualizar_grafico()
+
+    def atualizar_grafico(self):
+        """
+        Redesenha o gráfico interativo com a série e a articulação escolhidas, a partir
+        dos dados já baixados (sem nova requisição ao servidor).
+        """
+        serie = self.combo_serie.currentText()
+        chave_tempo, chave_valores, rotulo_y, legenda = self.SERIES_GRAFICO[serie]
+        self.combo_articulacao_grafico.setEnabled(chave_valores is None)
+        dados = self.dados_cinematica
+        if not dados:
+            return
+
+        titulo = serie
+        if chave_valores is None:
+            articulacao = self.combo_articulacao_grafico.currentText()
+            chave_valores = f'angulos/{articulacao}'
+            titulos = dict(zip(dados['articulacoes'][1], dados['titulos'][1]))
+            titulo = titulos.get(articulacao, articulacao)
+            rotulos = ["Direito", "Esquerdo"]
+        if chave_tempo not in dados or chave_valores not in dados:
+            self.grafico.definir_series([], [], titulo)
+            return
+
+        colunas = colunas_serie(dados[chave_valores])
+        if legenda is not None:
+            rotulos = [f"{legenda} {j + 1}" for j in range(len(colunas))]
+        eventos = [(nome.split('/', 1)[1], valores) for nome, (_, valores) in dados.items() if nome.startswith('eventos/')]
+
+        # Mesmo eixo de tempo do gráfico anterior (ex: outra articulação): mantém o zoom
+        self.grafico.definir_series(dados[chave_tempo][1], list(zip(rotulos, colunas)), titulo, rotulo_y, eventos,
+                                    manter_janela=chave_tempo == self.tempo_grafico)
+        self.tempo_grafico = chave_tempo
 
     def acao_baixar_zip(self):
         """
-        Abre diálogo para salvar o arquivo ZIP com todos os resultados.
+        Abre diálogo para salvar o arquivo ZIP com todos os resultados e inicia
+        o download em segundo plano.
         """
-        try:
-            caminho, _ = QFileDialog.getSaveFileName(self, "Salvar ZIP", f"Resultado_{self.id_tarefa}.zip", "ZIP (*.zip)")
-            if caminho:
-                with requests.get(f"{self.url_base_api}/download-zip/{self.id_tarefa}", stream=True) as r:
-                    with open(caminho, 'wb') as f:
-                        for chunk in r.iter_content(8192): f.write(chunk)
-                self.registrar_log("ZIP Salvo!")
-        except Exception as e: self.registrar_log(f"Erro download: {e}")
+        caminho, _ = QFileDialog.getSaveFileName(self, "Salvar ZIP", f"Resultado_{self.id_tarefa}.zip", "ZIP (*.zip)")
+        if not caminho:
+            return
+
+        self.btn_baixar.setEnabled(False)
+        self.barra_progresso.setValue(0)
+        self.registrar_log("Baixando ZIP...")
+        self.worker_download = WorkerDownload(self.url_base_api, self.id_tarefa, caminho, self.sessao_http)
+        self.worker_download.progresso.connect(self.barra_progresso.setValue)
+        self.worker_download.finalizado.connect(lambda c: self.registrar_log(f"ZIP Salvo em {c}!"))
+        self.worker_download.erro.connect(lambda e: self.registrar_log(f"Erro download: {e} (clique novamente para continuar)"))
+        self.worker_download.finished.connect(lambda: self.btn_baixar.setEnabled(True))
+        self.worker_download.start()
 
 if __name__ == '__main__':
     app = QApplication(sys.argv)
@@ -0,0 +1,667 @@
+"""
+Comunicação com a API do backend (backend/server.ipynb), sem dependência do PyQt.
+
+Reúne o protocolo usado tanto pelas threads da interface (app.py) quanto pelo
+processamento em lote pela linha de comando (lote.py): sessão HTTP keep-alive,
+upload retomável com deduplicação por SHA-256, acompanhamento do job por eventos
+(ou consultas ao /status), download retomável do ZIP e o pool de servidores.
+"""
+import os
+import re
+import time
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+import requests.exceptions
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+STATUS_FINAIS = ('concluido', 'erro', 'cancelado')
+# Articulações aceitas pelo servidor (joint_selection)
+ARTICULACOES = ("Joelho", "Quadril", "Tornozelo", "Ombro", "Cotovelo", "Punho")
+
+
+class ServidorSemResposta(Exception):
+    """O servidor parou de responder durante o acompanhamento de um job."""
+
+
+def criar_sessao_http(conexoes=8, tentativas=3):
+    """
+    Cria uma sessão HTTP com pool de conexões keep-alive, para reaproveitar a mesma
+    conexão TLS do túnel entre requisições, e novas tentativas com espera crescente
+    para falhas temporárias em requisições GET.
+
+    Args:
+        conexoes (int): Máximo de conexões simultâneas mantidas por host.
+        tentativas (int): Número de novas tentativas por requisição.
+
+    Returns:
+        requests.Session: Sessão configurada.
+    """
+    retry = Retry(total=tentativas, backoff_factor=0.5, status_forcelist=(502, 503, 504),
+                  allowed_methods=frozenset(['GET', 'HEAD']))
+    adaptador = HTTPAdapter(pool_connections=conexoes, pool_maxsize=conexoes, max_retries=retry)
+    sessao = requests.Session()
+    sessao.mount('http://', adaptador)
+    sessao.mount('https://', adaptador)
+    return sessao
+
+# ===============================================================
+# UPLOAD E INÍCIO DO PROCESSAMENTO
+# ===============================================================
+class EnvioVideo:
+    """
+    Envia um vídeo e as configurações para a API e dispara o processamento.
+    O vídeo é enviado em blocos para um upload retomável: se a conexão cair,
+    o envio continua a partir do último byte confirmado pelo servidor. Antes disso,
+    o SHA-256 do vídeo é consultado no servidor: se ele já tiver o mesmo vídeo (ex:
+    reenvio para analisar outra articulação), nenhum byte é transferido.
+    """
+    TAMANHO_BLOCO = 8 * 1024 * 1024
+    MAX_TENTATIVAS = 5
+
+    # Uploads interrompidos nesta sessão: (url, arquivo, tamanho, mtime) -> upload_id.
+    # Permite que um novo clique em "INICIAR ANÁLISE" continue o envio anterior.
+    uploads_pendentes = {}
+    # SHA-256 dos vídeos já calculados nesta sessão: (arquivo, tamanho, mtime) -> hash
+    hashes_calculados = {}
+
+    def __init__(self, url_api, caminho_video, selecao_articulacao, preprocessamento=None,
+                 ao_progresso=None, ao_log=None, upload_id=None, ao_criar_upload=None, sessao=None):
+        """
+        Inicializa o envio.
+
+        Args:
+            url_api (str): URL base da API (ex: Ngrok).
+            caminho_video (str): Caminho local do arquivo de vídeo.
+            selecao_articulacao (str): Nome da articulação selecionada.
+            preprocessamento (dict): Recorte/redução aplicados ao vídeo antes do envio,
+                repassados ao servidor para corrigir os tempos (None = vídeo original).
+            ao_progresso (callable): Recebe a porcentagem (int) enviada.
+            ao_log (callable): Recebe mensagens (str) para o log.
+            upload_id (str): Upload iniciado antes (ex: por um lote interrompido) a continuar.
+            ao_criar_upload (callable): Recebe o upload_id assim que o upload é criado,
+                para que quem chama possa guardá-lo e retomar o envio depois.
+            sessao (requests.Session): Sessão compartilhada (criada se omitida), que mantém
+                a conexão TLS do túnel aberta entre os blocos.
+        """
+        self.url_api = url_api.strip().rstrip('/')
+        self.caminho_video = caminho_video
+        self.selecao_articulacao = selecao_articulacao
+        self.preprocessamento = preprocessamento
+        self.ao_progresso = ao_progresso or (lambda porcentagem: None)
+        self.ao_log = ao_log or (lambda mensagem: None)
+        self.upload_id = upload_id
+        self.ao_criar_upload = ao_criar_upload or (lambda upload_id: None)
+        self.sessao = sessao or criar_sessao_http()
+
+    def executar(self):
+        """
+        Envia o vídeo em blocos (se o servidor ainda não o tiver) e dispara o
+        processamento no endpoint /processar.
+
+        Returns:
+            dict: Resposta do /processar (com o 'job_id').
+        """
+        url = f"{self.url_api}/processar"
+
+        carga_dados = {'joint_selection': self.selecao_articulacao}
+        if self.preprocessamento:
+            carga_dados['preprocessamento'] = json.dumps(self.preprocessamento)
+
+        resposta = self._processar_existente(carga_dados)
+        if resposta is not None:
+            self.ao_log("O servidor já tem este vídeo: envio dispensado.")
+            self.ao_progresso(100)
+        else:
+            upload_id = self._enviar_em_blocos()
+            if upload_id is None:
+                # Servidor antigo, sem upload retomável: envia o arquivo de uma vez
+                with open(self.caminho_video, 'rb') as f:
+                    arquivos = {'file': (os.path.basename(self.caminho_video), f, 'video/mp4')}
+                    resposta = self.sessao.post(url, files=arquivos, data=carga_dados, timeout=120)
+            else:
+                carga_dados['upload_id'] = upload_id
+                resposta = self.sessao.post(url, data=carga_dados, timeout=60)
+
+        resposta.raise_for_status()
+        return resposta.json()
+
+    def calcular_hash(self):
+        """
+        Calcula (ou reaproveita desta sessão) o SHA-256 do vídeo, lendo em blocos.
+
+        Returns:
+            str: Hash em hexadecimal.
+        """
+        chave = (os.path.abspath(self.caminho_video), os.path.getsize(self.caminho_video), os.path.getmtime(self.caminho_video))
+        if chave not in self.hashes_calculados:
+            h = hashlib.sha256()
+            with open(self.caminho_video, 'rb') as f:
+                while bloco := f.read(self.TAMANHO_BLOCO):
+                    h.update(bloco)
+            self.hashes_calculados[chave] = h.hexdigest()
+        return self.hashes_calculados[chave]
+
+    def _processar_existente(self, carga_dados):
+        """
+        Pergunta ao servidor (GET /videos/{sha256}) se ele já tem o vídeo e, se tiver,
+        dispara o processamento sem transferir o arquivo.
+
+        Returns:
+            requests.Response: Resposta do /processar, ou None se o vídeo precisa ser enviado.
+        """
+        hash_video = self.calcular_hash()
+        resposta = self.sessao.get(f"{self.url_api}/videos/{hash_video}", timeout=30)
+        if resposta.status_code != 200:
+            # 404: vídeo novo (ou servidor antigo, sem a consulta)
+            return None
+
+        dados = dict(carga_dados, hash_video=hash_video, nome_arquivo=os.path.basename(self.caminho_video))
+        resposta = self.sessao.post(f"{self.url_api}/processar", data=dados, timeout=60)
+        if resposta.status_code == 404:
+            # o vídeo foi removido do servidor entre a consulta e o pedido
+            return None
+        return resposta
+
+    def _enviar_em_blocos(self):
+        """
+        Envia o vídeo via /uploads, bloco a bloco, informando o progresso.
+
+        Returns:
+            str: upload_id do envio concluído, ou None se o servidor não suporta
+            upload retomável.
+        """
+        tamanho = os.path.getsize(self.caminho_video)
+        chave = (self.url_api, os.path.abspath(self.caminho_video), tamanho, os.path.getmtime(self.caminho_video))
+        upload_id, offset = self.upload_id or self.uploads_pendentes.get(chave), 0
+
+        if upload_id:
+            resposta = self.sessao.get(f"{self.url_api}/uploads/{upload_id}", timeout=30)
+            if resposta.status_code == 200:
+                offset = resposta.json()['offset']
+            else:
+                upload_id = None
+
+        if not upload_id:
+            resposta = self.sessao.post(f"{self.url_api}/uploads", timeout=30, data={
+                'nome_arquivo': os.path.basename(self.caminho_video), 'tamanho': tamanho})
+            if resposta.status_code in (404, 405):
+                return None
+            resposta.raise_for_status()
+            upload_id = resposta.json()['upload_id']
+            self.uploads_pendentes[chave] = upload_id
+            self.ao_criar_upload(upload_id)
+
+        url_upload = f"{self.url_api}/uploads/{upload_id}"
+        falhas = 0
+
+        with open(self.caminho_video, 'rb') as f:
+            while offset < tamanho:
+                try:
+                    f.seek(offset)
+                    bloco = f.read(self.TAMANHO_BLOCO)
+                    resposta = self.sessao.put(url_upload, data=bloco, headers={'Upload-Offset': str(offset)}, timeout=120)
+                    if resposta.status_code in (400, 409):
+                        # Servidor confirmou outro offset (bloco parcial ou fora de sincronia).
+                        # Conta como falha enquanto o envio não avançar, para não repetir para sempre
+                        confirmado = resposta.json().get('offset', offset)
+                        falhas = 0 if confirmado > offset else falhas + 1
+                        if falhas > self.MAX_TENTATIVAS:
+                            resposta.raise_for_status()
+                        offset = confirmado
+                        continue
+                    resposta.raise_for_status()
+                    offset = resposta.json()['offset']
+                    falhas = 0
+                except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                    falhas += 1
+                    if falhas > self.MAX_TENTATIVAS:
+                        raise
+                    time.sleep(2 ** falhas)
+                    # Retoma do último byte que o servidor confirmou ter gravado
+                    offset = self.sessao.get(url_upload, timeout=30).json()['offset']
+
+                self.ao_progresso(int(100 * offset / tamanho) if tamanho else 100)
+
+        self.uploads_pendentes.pop(chave, None)
+        return upload_id
+
+# ===============================================================
+# ACOMPANHAMENTO DO JOB
+# ===============================================================
+class AcompanhamentoJob:
+    """
+    Acompanha o job pelo stream de eventos (/eventos) da API, recebendo cada mudança
+    de etapa e progresso assim que acontece. Se o servidor não oferecer o stream,
+    consulta /status periodicamente.
+    """
+    INTERVALO_CONSULTA = 3  # Segundos entre consultas, apenas no modo sem stream
+    MAX_FALHAS = 5
+
+    def __init__(self, url_api, id_tarefa, ao_status=None):
+        """
+        Inicializa o acompanhamento.
+
+        Args:
+            url_api (str): URL base da API.
+            id_tarefa (str): ID do job a acompanhar.
+            ao_status (callable): Recebe cada estado (dict, no formato do /status).
+        """
+        self.url_api = url_api.strip().rstrip('/')
+        self.id_tarefa = id_tarefa
+        self.ao_status = ao_status or (lambda d: None)
+        self.usar_stream = True
+        self.ultimo_status = None
+        self._parar = False
+        self._resposta = None
+
+    def parar(self):
+        """Encerra o acompanhamento (fecha o stream aberto, se houver)."""
+        self._parar = True
+        if self._resposta is not None:
+            self._resposta.close()
+
+    def executar(self):
+        """
+        Acompanha o job até um status final, reconectando com espera crescente
+        quando a conexão cai.
+
+        Returns:
+            dict: Último estado recebido (None se interrompido antes de qualquer um).
+
+        Raises:
+            ServidorSemResposta: Após MAX_FALHAS falhas seguidas de conexão.
+        """
+        falhas = 0
+        while not self._parar:
+            try:
+                finalizado = self._acompanhar_stream() if self.usar_stream else self._consultar_status()
+                falhas = 0
+                if finalizado:
+                    break
+            except (requests.exceptions.RequestException, ValueError) as e:
+                if self._parar:
+                    break
+                falhas += 1
+                if falhas >= self.MAX_FALHAS:
+                    raise ServidorSemResposta(f"Sem resposta do servidor: {e}") from e
+                time.sleep(min(2 ** falhas, 10))
+            except Exception:
+                # parar() fecha o stream no meio da leitura (ex: job reenviado a outro servidor)
+                if self._parar:
+                    break
+                raise
+        return self.ultimo_status
+
+    def _receber(self, d):
+        self.ultimo_status = d
+        self.ao_status(d)
+        return d.get('status') in STATUS_FINAIS
+
+    def _acompanhar_stream(self):
+        """
+        Lê os eventos Server-Sent Events do job. Retorna True ao receber um status
+        final e False se o stream terminar antes (para reconectar).
+        """
+        url = f"{self.url_api}/eventos/{self.id_tarefa}"
+        # O servidor manda keep-alive a cada 15 s, então 30 s sem dados indica conexão perdida
+        with requests.get(url, stream=True, timeout=(10, 30)) as r:
+            if r.status_code in (404, 405):
+                # Servidor sem o endpoint de eventos: passa a consultar /status
+                self.usar_stream = False
+                return False
+            r.raise_for_status()
+            self._resposta = r
+            dados = []
+            for linha in r.iter_lines(decode_unicode=True):
+                if self._parar:
+                    return True
+                if linha.startswith('data:'):
+                    dados.append(linha[5:].strip())
+                elif not linha and dados:
+                    # Linha em branco fecha o evento
+                    d = json.loads('\n'.join(dados))
+                    dados = []
+                    if self._receber(d):
+                        return True
+            self._resposta = None
+        return False
+
+    def _consultar_status(self):
+        """Uma consulta a /status. Retorna True se o job chegou a um status final."""
+        r = requests.get(f"{self.url_api}/status/{self.id_tarefa}", timeout=10)
+        r.raise_for_status()
+        if self._receber(r.json()):
+            return True
+        for _ in range(self.INTERVALO_CONSULTA * 10):
+            if self._parar:
+                return True
+            time.sleep(0.1)
+        return False
+
+def consultar_status(url_api, id_tarefa, timeout=10):
+    """
+    Consulta o /status de um job.
+
+    Args:
+        url_api (str): URL base da API.
+        id_tarefa (str): ID do job.
+        timeout (float): Limite da consulta, em segundos.
+
+    Returns:
+        dict: Estado do job, ou None se o servidor não o conhece (404).
+    """
+    r = requests.get(f"{url_api.strip().rstrip('/')}/status/{id_tarefa}", timeout=timeout)
+    if r.status_code == 404:
+        return None
+    r.raise_for_status()
+    return r.json()
+
+def cancelar_job(url_api, id_tarefa, timeout=5):
+    """
+    Pede ao servidor o cancelamento de um job (na fila ou em andamento).
+
+    Args:
+        url_api (str): URL base da API.
+        id_tarefa (str): ID do job (ou do lote).
+        timeout (float): Limite da requisição, em segundos.
+    """
+    requests.post(f"{url_api.strip().rstrip('/')}/cancelar/{id_tarefa}", timeout=timeout)
+
+# ===============================================================
+# DOWNLOADS RETOMÁVEIS (ZIP E DADOS)
+# ===============================================================
+def baixar_retomando(sessao, url, destino, etag=None, max_tentativas=5, parar=None,
+                     ao_resposta=None, ao_progresso=None, tamanho_bloco=256 * 1024):
+    """
+    GET em fluxo que, se a conexão cair, continua do último byte recebido (HTTP Range
+    com If-Range). Os bytes são acrescentados a `destino`, um arquivo binário aberto
+    para acréscimo ('ab') ou um io.BytesIO; se o servidor entregar o conteúdo inteiro
+    (sem suporte a Range ou conteúdo mudou), `destino` é esvaziado antes.
+
+    Args:
+        sessao (requests.Session): Sessão usada nas requisições.
+        url (str): URL do conteúdo.
+        destino (file): Onde gravar; o que já houver nele é retomado se `etag` for dado.
+        etag (str): ETag do conteúdo já presente em `destino`.
+        max_tentativas (int): Falhas seguidas de conexão toleradas antes de desistir.
+        parar (threading.Event): Quando marcado, interrompe o download.
+        ao_resposta (callable): Recebe cada resposta aceita (para ler o ETag ou fechá-la).
+        ao_progresso (callable): Recebe a porcentagem (int) recebida.
+        tamanho_bloco (int): Tamanho dos blocos lidos da resposta.
+
+    Returns:
+        str: ETag do conteúdo baixado.
+
+    Raises:
+        ServidorSemResposta: Se o download for interrompido por `parar`.
+    """
+    parar = parar or threading.Event()
+    falhas = 0
+    while True:
+        try:
+            destino.seek(0, os.SEEK_END)
+            recebido = destino.tell() if etag else 0
+            cabecalhos = {'Range': f'bytes={recebido}-', 'If-Range': etag} if recebido else {}
+
+            with sessao.get(url, headers=cabecalhos, stream=True, timeout=(10, 60)) as r:
+                r.raise_for_status()
+                if r.status_code == 206:
+                    total = int(r.headers['Content-Range'].rsplit('/', 1)[1])
+                else:
+                    total = int(r.headers.get('Content-Length', 0))
+                    recebido = 0
+                    destino.seek(0)
+                    destino.truncate()
+                etag = r.headers.get('ETag')
+                if ao_resposta is not None:
+                    ao_resposta(r)
+
+                for bloco in r.iter_content(tamanho_bloco):
+                    destino.write(bloco)
+                    recebido += len(bloco)
+                    if total and ao_progresso is not None:
+                        ao_progresso(int(100 * recebido / total))
+
+            if not total or recebido >= total:
+                return etag
+            falhas = 0
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout,
+                requests.exceptions.ChunkedEncodingError):
+            if parar.is_set():
+                raise ServidorSemResposta("Download interrompido")
+            falhas += 1
+            if falhas > max_tentativas:
+                raise
+            parar.wait(2 ** falhas)
+        except Exception:
+            # quem chama pode fechar a resposta no meio da leitura para interromper
+            if parar.is_set():
+                raise ServidorSemResposta("Download interrompido")
+            raise
+        if parar.is_set():
+            raise ServidorSemResposta("Download interrompido")
+
+class DownloadZip:
+    """
+    Baixa o ZIP com todos os resultados de um job. O arquivo é gravado em
+    '<destino>.part' e, se a conexão cair, o download continua do último byte
+    recebido (HTTP Range), inclusive numa nova chamada para o mesmo destino.
+    """
+    MAX_TENTATIVAS = 5
+
+    # Downloads interrompidos nesta sessão: (url, destino) -> ETag do ZIP.
+    # Garante que só se retoma um .part do mesmo conteúdo que o servidor ainda entrega.
+    downloads_pendentes = {}
+
+    def __init__(self, url_api, id_tarefa, caminho_destino, sessao=None, ao_progresso=None, etag=None, ao_etag=None):
+        """
+        Inicializa o download.
+
+        Args:
+            url_api (str): URL base da API.
+            id_tarefa (str): ID do job processado.
+            caminho_destino (str): Caminho local onde o ZIP será salvo.
+            sessao (requests.Session): Sessão compartilhada (criada se omitida).
+            ao_progresso (callable): Recebe a porcentagem (int) recebida.
+            etag (str): ETag de um '.part' deixado por uma execução anterior, para retomá-lo.
+            ao_etag (callable): Recebe o ETag de cada resposta, para quem chama guardá-lo.
+        """
+        self.url = f"{url_api.strip().rstrip('/')}/download-zip/{id_tarefa}"
+        self.caminho_destino = caminho_destino
+        self.caminho_parcial = caminho_destino + '.part'
+        self.sessao = sessao or criar_sessao_http()
+        self.ao_progresso = ao_progresso or (lambda porcentagem: None)
+        self.ao_etag = ao_etag or (lambda etag: None)
+        self.chave = (self.url, os.path.abspath(self.caminho_destino))
+        self._parar = threading.Event()
+        self._resposta = None
+        if etag:
+            self.downloads_pendentes.setdefault(self.chave, etag)
+
+    def parar(self):
+        """Interrompe o download (o '.part' fica para ser retomado depois)."""
+        self._parar.set()
+        if self._resposta is not None:
+            self._resposta.close()
+
+    def executar(self):
+        """
+        Baixa o ZIP em fluxo, retomando após falhas de conexão.
+
+        Returns:
+            str: Caminho do ZIP salvo.
+
+        Raises:
+            ServidorSemResposta: Se o download for interrompido por parar().
+        """
+        etag = self.downloads_pendentes.get(self.chave)
+        modo = 'ab' if etag and os.path.exists(self.caminho_parcial) else 'wb'
+        with open(self.caminho_parcial, modo) as f:
+            baixar_retomando(self.sessao, self.url, f, etag=etag, max_tentativas=self.MAX_TENTATIVAS,
+                             parar=self._parar, ao_resposta=self._ao_resposta, ao_progresso=self.ao_progresso)
+
+        os.replace(self.caminho_parcial, self.caminho_destino)
+        self.downloads_pendentes.pop(self.chave, None)
+        return self.caminho_destino
+
+    def _ao_resposta(self, resposta):
+        """Guarda a resposta (para parar() fechá-la) e o ETag do .part."""
+        self._resposta = resposta
+        self.downloads_pendentes[self.chave] = resposta.headers.get('ETag')
+        self.ao_etag(resposta.headers.get('ETag'))
+
+# ===============================================================
+# POOL DE SERVIDORES (VÁRIOS RUNTIMES)
+# ===============================================================
+def ler_urls_api(texto):
+    """
+    Separa as URLs digitadas no campo de conexão (uma ou várias, separadas por
+    vírgula, ponto e vírgula ou espaço), sem repetições.
+
+    Args:
+        texto (str): Conteúdo do campo de URL.
+
+    Returns:
+        list: URLs http/https, sem a barra final, na ordem em que foram digitadas.
+    """
+    urls = [u.strip().rstrip('/') for u in re.split(r'[\s,;]+', texto)]
+    return list(OrderedDict.fromkeys(u for u in urls if u.startswith("http")))
+
+def consultar_saude(url_api, sessao=None, timeout=3):
+    """
+    Consulta o /health de um servidor.
+
+    Args:
+        url_api (str): URL base da API.
+        sessao (requests.Session): Sessão a reaproveitar (None = requisição avulsa).
+        timeout (float): Limite da consulta, em segundos.
+
+    Returns:
+        dict: Resposta do /health, ou None se o servidor não respondeu com 200.
+    """
+    try:
+        resposta = (sessao or requests).get(f"{url_api}/health", timeout=timeout)
+        return resposta.json() if resposta.status_code == 200 else None
+    except (requests.exceptions.RequestException, ValueError):
+        return None
+
+class PoolServidores:
+    """
+    Servidores (runtimes do Colab) disponíveis para os jobs, com o último estado de
+    saúde e carga de cada um. Cada job novo vai para o servidor online menos carregado:
+    jobs na fila e em execução (informados pelo /health) por worker, mais os jobs que
+    este cliente já mandou para ele desde a última consulta. Thread-safe.
+    """
+    FALHAS_PARA_QUEDA = 2 # Consultas seguidas sem resposta para considerar o servidor offline
+
+    def __init__(self, urls):
+        """
+        Inicializa o pool com todos os servidores offline até a primeira consulta.
+
+        Args:
+            urls (list): URLs base das APIs.
+        """
+        self._lock = threading.Lock()
+        self.estados = OrderedDict((url, {'online': False, 'falhas': 0, 'modelos_prontos': False, 'fila': 0,
+                                          'em_execucao': 0, 'workers': 1, 'atribuidos': 0}) for url in urls)
+
+    @property
+    def urls(self):
+        """list: URLs de todos os servidores, na ordem informada."""
+        return list(self.estados)
+
+    def online(self):
+        """
+        Returns:
+            list: URLs dos servidores considerados online.
+        """
+        with self._lock:
+            return [url for url, estado in self.estados.items() if estado['online']]
+
+    def atualizar(self, url, saude):
+        """
+        Registra o resultado de uma consulta ao /health.
+
+        Args:
+            url (str): Servidor consultado.
+            saude (dict): Resposta do /health, ou None se ele não respondeu.
+
+        Returns:
+            bool: True se o servidor passou de online para offline ou vice-versa.
+        """
+        with self._lock:
+            estado = self.estados[url]
+            antes = estado['online']
+            if saude is None:
+                estado['falhas'] += 1
+                if estado['falhas'] >= self.FALHAS_PARA_QUEDA:
+                    estado['online'] = False
+            else:
+                # Servidores antigos não informam a carga: contam como vazios
+                estado.update(online=True, falhas=0, atribuidos=0,
+                              modelos_prontos=saude.get('modelos_prontos', True),
+                              fila=saude.get('fila', 0), em_execucao=saude.get('em_execucao', 0),
+                              workers=max(1, saude.get('workers', 1)))
+            return estado['online'] != antes
+
+    def _carga(self, url):
+        estado = self.estados[url]
+        # Um servidor ainda carregando os modelos vale como um job a mais
+        pendentes = estado['fila'] + estado['em_execucao'] + estado['atribuidos'] + (0 if estado['modelos_prontos'] else 1)
+        return pendentes / estado['workers']
+
+    def escolher(self, excluir=()):
+        """
+        Reserva o servidor online menos carregado para um job novo (no empate, o
+        primeiro da lista).
+
+        Args:
+            excluir (tuple): Servidores a evitar (ex: o que acabou de cair).
+
+        Returns:
+            str: URL escolhida, ou None se não houver servidor disponível.
+        """
+        with self._lock:
+            candidatos = [url for url, estado in self.estados.items() if estado['online'] and url not in excluir]
+            if not candidatos:
+                return None
+            url = min(candidatos, key=self._carga)
+            self.estados[url]['atribuidos'] += 1
+            return url
+
+    def descrever(self, url):
+        """
+        Returns:
+            str: Carga do servidor para o log (ex: "fila 2, 1 em execução, 1 worker(s)").
+        """
+        with self._lock:
+            estado = self.estados[url]
+            return f"fila {estado['fila']}, {estado['em_execucao']} em execução, {estado['workers']} worker(s)"
+
+def monitorar_pool(pool, parar, ao_mudar=None, intervalo=5):
+    """
+    Consulta o /health de todos os servidores do pool em paralelo, a cada `intervalo`
+    segundos, até `parar` ser marcado.
+
+    Args:
+        pool (PoolServidores): Pool a manter atualizado.
+        parar (threading.Event): Sinal para encerrar o monitoramento.
+        ao_mudar (callable): Recebe (url, online) quando um servidor cai ou volta.
+        intervalo (float): Segundos entre rodadas de consultas.
+    """
+    urls = pool.urls
+    sessao = criar_sessao_http(conexoes=len(urls), tentativas=0)
+    with ThreadPoolExecutor(max_workers=len(urls)) as executor:
+        while not parar.is_set():
+            for url, saude in zip(urls, executor.map(lambda u: consultar_saude(u, sessao), urls)):
+                if parar.is_set():
+                    return
+                if pool.atualizar(url, saude) and ao_mudar is not None:
+                    ao_mudar(url, saude is not None)
+            parar.wait(intervalo)
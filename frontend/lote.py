@@ -0,0 +1,433 @@
+"""
+Processamento em lote de vídeos pela linha de comando, sem interface gráfica.
+
+Envia uma pasta de vídeos (ou um manifesto com a articulação de cada um) para a API
+e baixa o ZIP de resultados de cada job, sobrepondo as etapas: enquanto o vídeo N é
+processado no servidor, o N+1 já está sendo enviado e o ZIP do N-1 é baixado. Usa o
+mesmo protocolo do app (cliente_api.py): deduplicação pelo SHA-256, upload e download
+retomáveis e, com várias URLs, o servidor menos carregado para cada job (se um
+servidor cair, os seus jobs são reenviados a outro).
+
+O estado de cada vídeo fica em <saída>/lote_estado.json, gravado a cada mudança de
+etapa: rodar o mesmo comando depois de uma queda (ou de um Ctrl+C) retoma o lote.
+Vídeos concluídos são pulados, jobs que o servidor ainda conhece são reacompanhados
+e envios e downloads continuam do último byte. Ao final, o resumo é impresso e
+gravado em <saída>/lote_relatorio.csv.
+
+Manifesto: .csv com as colunas video,articulacao (cabeçalho opcional; sem a
+articulação vale --articulacao) ou .json com uma lista de {"video": ..., "articulacao": ...}.
+Caminhos relativos partem da pasta do manifesto.
+
+Uso:
+    python frontend/lote.py videos/ --url https://seu-dominio.ngrok-free.app --saida resultados/
+    python frontend/lote.py manifesto.csv --url https://a.ngrok-free.app,https://b.ngrok-free.app --em-andamento 4
+"""
+import os
+import sys
+import csv
+import json
+import time
+import hashlib
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+import requests.exceptions
+
+diretorio_atual = os.path.dirname(os.path.abspath(__file__))
+diretorio_raiz = os.path.dirname(diretorio_atual)
+sys.path.append(diretorio_raiz)
+
+from frontend.cliente_api import (ARTICULACOES, STATUS_FINAIS, EnvioVideo, AcompanhamentoJob, ServidorSemResposta,
+                                  DownloadZip, ler_urls_api, consultar_saude, consultar_status, cancelar_job,
+                                  criar_sessao_http, PoolServidores, monitorar_pool)
+
+ARQUIVO_ESTADO = "lote_estado.json"
+ARQUIVO_RELATORIO = "lote_relatorio.csv"
+
+# Etapas de cada vídeo no arquivo de estado, na ordem em que acontecem
+ETAPAS = ('pendente', 'enviando', 'processando', 'baixando', 'concluido', 'erro')
+
+
+class ErroJob(Exception):
+    """Falha de um vídeo. `definitiva`: o próprio pipeline falhou e repetir não adianta."""
+
+    def __init__(self, mensagem: str, definitiva: bool = False):
+        super().__init__(mensagem)
+        self.definitiva = definitiva
+
+
+def normalizar_articulacao(nome: str) -> str:
+    for articulacao in ARTICULACOES:
+        if articulacao.lower() == nome.strip().lower():
+            return articulacao
+    raise ValueError(f"Articulação desconhecida: '{nome}' (opções: {', '.join(ARTICULACOES)})")
+
+
+def ler_entrada(caminho: str, articulacao_padrao: str) -> list:
+    """Lista de (vídeo, articulação) de uma pasta de .mp4 ou de um manifesto .csv/.json."""
+    if os.path.isdir(caminho):
+        nomes = sorted(n for n in os.listdir(caminho) if n.lower().endswith('.mp4'))
+        return [(os.path.join(caminho, n), articulacao_padrao) for n in nomes]
+
+    base = os.path.dirname(os.path.abspath(caminho))
+    with open(caminho, encoding='utf-8-sig') as f:
+        if caminho.lower().endswith('.json'):
+            linhas = [[e] if isinstance(e, str) else [e['video'], e.get('articulacao')] for e in json.load(f)]
+        else:
+            linhas = [l for l in csv.reader(f) if l and l[0].strip()]
+            if linhas and linhas[0][0].strip().lower() == 'video':
+                linhas = linhas[1:]
+    return [(os.path.join(base, l[0].strip()), l[1] if len(l) > 1 and l[1] else articulacao_padrao) for l in linhas]
+
+
+class EstadoLote:
+    """Estado de cada vídeo do lote, gravado em JSON (de forma atômica) a cada mudança."""
+
+    def __init__(self, caminho: str):
+        self.caminho = caminho
+        self._lock = threading.Lock()
+        self.itens = {}
+        if os.path.exists(caminho):
+            with open(caminho, encoding='utf-8') as f:
+                self.itens = json.load(f)['itens']
+
+    def registrar(self, chave: str, **inicial) -> dict:
+        """Item do vídeo `chave`, criado com `inicial` se ainda não existir (grava só em `gravar`)."""
+        with self._lock:
+            return self.itens.setdefault(chave, dict(inicial, etapa='pendente', tentativas=0))
+
+    def atualizar(self, chave: str, **campos):
+        with self._lock:
+            self.itens[chave].update(campos)
+            self._gravar()
+
+    def gravar(self):
+        with self._lock:
+            self._gravar()
+
+    def _gravar(self):
+        temporario = self.caminho + '.tmp'
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump({'itens': self.itens}, f, indent=1, ensure_ascii=False)
+        os.replace(temporario, self.caminho)
+
+
+class ProcessadorLote:
+    """Conduz cada vídeo por envio, processamento e download, com vagas limitadas por etapa."""
+
+    def __init__(self, pool: PoolServidores, estado: EstadoLote, opcoes):
+        self.pool = pool
+        self.estado = estado
+        self.opcoes = opcoes
+        self.sessao = criar_sessao_http(conexoes=(opcoes.envios + opcoes.downloads) * 2)
+        self.vagas_envio = threading.Semaphore(opcoes.envios)
+        self.vagas_download = threading.Semaphore(opcoes.downloads)
+        self.parar = threading.Event()
+        self._em_curso = {}  # chave -> (servidor, AcompanhamentoJob ou DownloadZip) em andamento
+        self._lock_log = threading.Lock()
+        self.total = 0
+
+    def log(self, chave: str, mensagem: str):
+        item = self.estado.itens.get(chave, {})
+        prefixo = f"({item.get('ordem', '?')}/{self.total}) {os.path.basename(item.get('video', ''))} [{item.get('articulacao', '')}]" if chave else "lote"
+        with self._lock_log:
+            print(f"[{time.strftime('%H:%M:%S')}] {prefixo}: {mensagem}", flush=True)
+
+    def ao_mudar_servidor(self, url: str, online: bool):
+        """Com o servidor fora do ar, encerra já o acompanhamento e o download dos seus jobs (serão reenviados)."""
+        self.log(None, f"servidor {'online' if online else 'offline'}: {url}")
+        if not online:
+            for servidor, tarefa in list(self._em_curso.values()):
+                if servidor == url:
+                    tarefa.parar()
+
+    def processar(self, chave: str):
+        """Leva o vídeo até o ZIP baixado, com novas tentativas (em outro servidor, se houver)."""
+        item = self.estado.itens[chave]
+        servidores_com_falha = set()
+        while not self.parar.is_set():
+            try:
+                self._executar(chave, servidores_com_falha)
+                return
+            except ErroJob as e:
+                tentativas = item['tentativas'] + 1
+                definitiva = e.definitiva or tentativas > self.opcoes.tentativas
+                self.estado.atualizar(chave, tentativas=tentativas, erro=str(e), erro_servidor=e.definitiva,
+                                      **({'etapa': 'erro'} if definitiva else {}))
+                if definitiva:
+                    self.log(chave, f"ERRO: {e}")
+                    return
+                self.log(chave, f"falha ({e}); nova tentativa {tentativas}/{self.opcoes.tentativas}")
+                time.sleep(min(2 ** tentativas, 30))
+
+    def _executar(self, chave: str, servidores_com_falha: set):
+        item = self.estado.itens[chave]
+        if not (item.get('job_id') and self._job_no_servidor(chave)):
+            self._enviar(chave, servidores_com_falha)
+        try:
+            self._acompanhar(chave)
+            self._baixar(chave)
+        except ErroJob as e:
+            if not e.definitiva:
+                servidores_com_falha.add(item['servidor'])
+            raise
+
+    def _job_no_servidor(self, chave: str) -> bool:
+        """Se o job de uma execução anterior ainda existe no servidor (para reacompanhá-lo)."""
+        item = self.estado.itens[chave]
+        try:
+            status = consultar_status(item['servidor'], item['job_id'])
+        except requests.exceptions.RequestException:
+            status = None
+        if status is None or status.get('expirado'):
+            self._abandonar_job(chave)
+            return False
+        self.log(chave, f"retomando o job {item['job_id'][:8]} ({status.get('status')})")
+        return True
+
+    def _abandonar_job(self, chave: str):
+        """Esquece o job atual do vídeo, cancelando-o no servidor caso ele ainda exista."""
+        item = self.estado.itens[chave]
+        servidor, job_id = item.get('servidor'), item.get('job_id')
+        if job_id:
+            threading.Thread(target=lambda: self._cancelar_silenciosamente(servidor, job_id), daemon=True).start()
+        self.estado.atualizar(chave, job_id=None, etag=None, etapa='pendente')
+
+    @staticmethod
+    def _cancelar_silenciosamente(servidor: str, job_id: str):
+        try:
+            cancelar_job(servidor, job_id)
+        except requests.exceptions.RequestException:
+            pass
+
+    def _escolher_servidor(self, chave: str, servidores_com_falha: set) -> str:
+        """Servidor menos carregado (evitando os que já falharam com este vídeo), esperando um ficar online."""
+        item = self.estado.itens[chave]
+        limite = time.time() + self.opcoes.espera_servidor
+        avisado = False
+        while not self.parar.is_set() and time.time() < limite:
+            # um upload interrompido continua no mesmo servidor, se ele ainda estiver no ar
+            if item.get('upload_id') and item.get('servidor') in self.pool.online():
+                return item['servidor']
+            url = self.pool.escolher(excluir=servidores_com_falha) or self.pool.escolher()
+            if url:
+                return url
+            if not avisado:
+                self.log(chave, "aguardando um servidor online...")
+                avisado = True
+            self.parar.wait(2)
+        raise ErroJob("nenhum servidor online")
+
+    def _enviar(self, chave: str, servidores_com_falha: set):
+        item = self.estado.itens[chave]
+        url = self._escolher_servidor(chave, servidores_com_falha)
+        if url != item.get('servidor'):
+            self.estado.atualizar(chave, upload_id=None)
+        with self.vagas_envio:
+            self.estado.atualizar(chave, etapa='enviando', servidor=url)
+            self.log(chave, f"enviando para {url} ({self.pool.descrever(url)})")
+            inicio = time.perf_counter()
+            envio = EnvioVideo(url, item['video'], item['articulacao'], upload_id=item.get('upload_id'),
+                               ao_log=lambda mensagem: self.log(chave, mensagem),
+                               ao_criar_upload=lambda upload_id: self.estado.atualizar(chave, upload_id=upload_id),
+                               sessao=self.sessao)
+            try:
+                resposta = envio.executar()
+            except (requests.exceptions.RequestException, ValueError, KeyError) as e:
+                # a próxima tentativa deste vídeo prefere outro servidor
+                servidores_com_falha.add(url)
+                raise ErroJob(f"envio: {e}")
+        segundos = time.perf_counter() - inicio
+        self.estado.atualizar(chave, etapa='processando', job_id=resposta['job_id'], upload_id=None, etag=None,
+                              envio_s=round(segundos, 1), enviado_em=time.time())
+        self.log(chave, f"enviado em {segundos:.1f} s (job {resposta['job_id'][:8]})")
+
+    def _acompanhar(self, chave: str):
+        item = self.estado.itens[chave]
+        acompanhamento = AcompanhamentoJob(item['servidor'], item['job_id'])
+        self._em_curso[chave] = (item['servidor'], acompanhamento)
+        try:
+            final = acompanhamento.executar()
+        except ServidorSemResposta as e:
+            raise ErroJob(str(e))
+        finally:
+            self._em_curso.pop(chave, None)
+
+        if self.parar.is_set():
+            raise ErroJob("interrompido")
+        status = (final or {}).get('status')
+        if status not in STATUS_FINAIS:
+            # acompanhamento encerrado pelo monitor: o servidor caiu no meio do job
+            self._abandonar_job(chave)
+            raise ErroJob(f"o servidor {item['servidor']} parou de responder")
+        if status != 'concluido':
+            self.estado.atualizar(chave, job_id=None)
+            raise ErroJob(final.get('error_message') or f"job {status} no servidor", definitiva=status == 'erro')
+        if item.get('enviado_em'):
+            self.estado.atualizar(chave, processamento_s=round(time.time() - item['enviado_em'], 1))
+
+    def _baixar(self, chave: str):
+        item = self.estado.itens[chave]
+
+        def guardar_etag(etag):
+            # o ETag permite retomar o .part mesmo depois de uma queda do próprio lote
+            if etag != item.get('etag'):
+                self.estado.atualizar(chave, etag=etag)
+
+        with self.vagas_download:
+            self.estado.atualizar(chave, etapa='baixando')
+            inicio = time.perf_counter()
+            download = DownloadZip(item['servidor'], item['job_id'], item['zip'], self.sessao,
+                                   etag=item.get('etag'), ao_etag=guardar_etag)
+            self._em_curso[chave] = (item['servidor'], download)
+            try:
+                download.executar()
+            except ServidorSemResposta:
+                if self.parar.is_set():
+                    raise ErroJob("interrompido")
+                self._abandonar_job(chave)
+                raise ErroJob(f"o servidor {item['servidor']} parou de responder")
+            except requests.exceptions.HTTPError as e:
+                if e.response is not None and e.response.status_code == 410:
+                    # resultados expirados no servidor: o vídeo é processado de novo
+                    self._abandonar_job(chave)
+                raise ErroJob(f"download: {e}")
+            except (requests.exceptions.RequestException, OSError) as e:
+                raise ErroJob(f"download: {e}")
+            finally:
+                self._em_curso.pop(chave, None)
+        segundos = time.perf_counter() - inicio
+        self.estado.atualizar(chave, etapa='concluido', download_s=round(segundos, 1), erro=None, etag=None)
+        self.log(chave, f"ZIP salvo em {item['zip']} ({os.path.getsize(item['zip']) / 1e6:.1f} MB, {segundos:.1f} s)")
+
+
+def nome_zip(video: str, articulacao: str, usados: set) -> str:
+    """Nome do ZIP de um vídeo, único no lote (vídeos de mesmo nome em pastas diferentes)."""
+    base = f"{os.path.splitext(os.path.basename(video))[0]}_{articulacao.lower()}"
+    if base in usados:
+        base += "_" + hashlib.sha1(os.path.abspath(video).encode()).hexdigest()[:6]
+    usados.add(base)
+    return base + ".zip"
+
+
+def resumir(estado: EstadoLote, chaves: list, duracao_s: float, caminho_relatorio: str):
+    """Imprime o resumo do lote e grava uma linha por vídeo no CSV do relatório."""
+    itens = [estado.itens[c] for c in chaves]
+    contagem = {etapa: sum(1 for i in itens if i['etapa'] == etapa) for etapa in ETAPAS}
+    concluidos = [i for i in itens if i['etapa'] == 'concluido']
+
+    print(f"\nLote: {len(itens)} vídeo(s) em {duracao_s / 60:.1f} min | "
+          + ", ".join(f"{etapa}: {n}" for etapa, n in contagem.items() if n))
+    if concluidos and duracao_s > 0:
+        print(f"Vazão: {3600 * len(concluidos) / duracao_s:.1f} vídeos/h")
+    for campo, nome in (('envio_s', "envio"), ('processamento_s', "processamento"), ('download_s', "download")):
+        valores = [i[campo] for i in concluidos if i.get(campo) is not None]
+        if valores:
+            print(f"  {nome:<14} média {sum(valores) / len(valores):8.1f} s   máx {max(valores):8.1f} s")
+    for i in itens:
+        if i['etapa'] == 'erro':
+            print(f"  ERRO {os.path.basename(i['video'])} [{i['articulacao']}]: {i.get('erro')}")
+
+    colunas = ['video', 'articulacao', 'etapa', 'servidor', 'job_id', 'tentativas', 'envio_s', 'processamento_s',
+               'download_s', 'zip', 'erro']
+    with open(caminho_relatorio, 'w', newline='', encoding='utf-8') as f:
+        escritor = csv.DictWriter(f, fieldnames=colunas, extrasaction='ignore')
+        escritor.writeheader()
+        escritor.writerows(dict(i, zip=i['zip'] if i['etapa'] == 'concluido' else '') for i in itens)
+    print(f"Relatório: {caminho_relatorio}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('entrada', help="Pasta com os vídeos .mp4 ou manifesto .csv/.json")
+    parser.add_argument('--url', required=True, help="URL da API (várias separadas por vírgula)")
+    parser.add_argument('--saida', default="resultados_lote", help="Pasta dos ZIPs, do estado e do relatório")
+    parser.add_argument('--articulacao', default="Joelho", help="Articulação dos vídeos sem articulação no manifesto")
+    parser.add_argument('--em-andamento', type=int, default=3, help="Vídeos no pipeline (envio, servidor, download) ao mesmo tempo")
+    parser.add_argument('--envios', type=int, default=1, help="Uploads simultâneos")
+    parser.add_argument('--downloads', type=int, default=1, help="Downloads simultâneos")
+    parser.add_argument('--tentativas', type=int, default=3, help="Novas tentativas de cada vídeo após falhas de comunicação")
+    parser.add_argument('--espera-servidor', type=float, default=900, help="Segundos aguardando um servidor online antes de desistir do vídeo")
+    parser.add_argument('--refazer-erros', action='store_true', help="Reprocessa também os vídeos em que o pipeline falhou")
+    opcoes = parser.parse_args()
+
+    urls = ler_urls_api(opcoes.url)
+    if not urls:
+        parser.error("Informe ao menos uma URL http/https em --url.")
+    try:
+        articulacao_padrao = normalizar_articulacao(opcoes.articulacao)
+        entrada = [(os.path.abspath(v), normalizar_articulacao(a)) for v, a in ler_entrada(opcoes.entrada, articulacao_padrao)]
+    except (OSError, ValueError, KeyError) as e:
+        parser.error(f"Entrada inválida: {e}")
+    faltando = [v for v, _ in entrada if not os.path.isfile(v)]
+    if faltando:
+        parser.error("Vídeos não encontrados: " + ", ".join(faltando))
+    if not entrada:
+        parser.error("Nenhum vídeo .mp4 na entrada.")
+
+    os.makedirs(opcoes.saida, exist_ok=True)
+    estado = EstadoLote(os.path.join(opcoes.saida, ARQUIVO_ESTADO))
+    chaves, usados = [], {os.path.splitext(os.path.basename(i['zip']))[0] for i in estado.itens.values()}
+    for ordem, (video, articulacao) in enumerate(entrada, start=1):
+        chave = f"{video}|{articulacao}"
+        if chave in chaves:
+            continue
+        chaves.append(chave)
+        if chave not in estado.itens:
+            zip_destino = os.path.join(os.path.abspath(opcoes.saida), nome_zip(video, articulacao, usados))
+            estado.registrar(chave, video=video, articulacao=articulacao, zip=zip_destino)
+        estado.itens[chave]['ordem'] = ordem
+    estado.gravar()
+
+    # Vídeos que já terminaram numa execução anterior ficam de fora
+    pendentes = []
+    for chave in chaves:
+        item = estado.itens[chave]
+        if item['etapa'] == 'concluido' and os.path.exists(item['zip']):
+            continue
+        if item['etapa'] == 'erro':
+            if item.get('erro_servidor') and not opcoes.refazer_erros:
+                continue
+            estado.atualizar(chave, etapa='pendente', tentativas=0)
+        pendentes.append(chave)
+
+    pool = PoolServidores(urls)
+    with ThreadPoolExecutor(max_workers=len(urls)) as executor:
+        for url, saude in zip(urls, executor.map(consultar_saude, urls)):
+            pool.atualizar(url, saude)
+    processador = ProcessadorLote(pool, estado, opcoes)
+    processador.total = len(chaves)
+    processador.log(None, f"{len(pendentes)} de {len(chaves)} vídeo(s) a processar; "
+                          f"{len(pool.online())} de {len(urls)} servidor(es) online")
+
+    parar_monitor = threading.Event()
+    threading.Thread(target=monitorar_pool, args=(pool, parar_monitor, processador.ao_mudar_servidor), daemon=True).start()
+
+    inicio = time.perf_counter()
+    executor = ThreadPoolExecutor(max_workers=max(1, opcoes.em_andamento))
+    try:
+        futuros = [executor.submit(processador.processar, chave) for chave in pendentes]
+        for futuro in futuros:
+            while not futuro.done():
+                time.sleep(0.2)  # espera em fatias para atender o Ctrl+C
+            futuro.result()
+    except KeyboardInterrupt:
+        processador.parar.set()
+        for _, tarefa in list(processador._em_curso.values()):
+            tarefa.parar()
+        processador.log(None, "interrompido: o estado foi salvo, rode o mesmo comando para retomar")
+        resumir(estado, chaves, time.perf_counter() - inicio, os.path.join(opcoes.saida, ARQUIVO_RELATORIO))
+        # uploads e downloads em andamento não são esperados: continuam do último byte na próxima execução
+        os._exit(130)
+    finally:
+        parar_monitor.set()
+    executor.shutdown()
+
+    resumir(estado, chaves, time.perf_counter() - inicio, os.path.join(opcoes.saida, ARQUIVO_RELATORIO))
+    sys.exit(1 if any(estado.itens[c]['etapa'] == 'erro' for c in chaves) else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+"""
+Testes do leitor de .npz sem NumPy (`ler_npz`), usado pelos gráficos interativos.
+
+Uso (na raiz do projeto):
+    python -m unittest discover -s frontend -p "test_*.py"
+"""
+import io
+import os
+import sys
+import struct
+import zipfile
+import unittest
+
+diretorio_raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(diretorio_raiz)
+
+from frontend.app import ler_npz, colunas_serie
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def npy_manual(descr: str, formato: tuple, dados: bytes, versao: int = 1) -> bytes:
+    """Monta um .npy byte a byte (sem NumPy), com o cabeçalho alinhado a 64 bytes."""
+    cabecalho = repr({'descr': descr, 'fortran_order': False, 'shape': formato}).encode('latin1')
+    prefixo = 10 if versao == 1 else 12
+    cabecalho += b' ' * (-(prefixo + len(cabecalho) + 1) % 64) + b'\n'
+    tamanho = struct.pack('<H', len(cabecalho)) if versao == 1 else struct.pack('<I', len(cabecalho))
+    return b'\x93NUMPY' + bytes([versao, 0]) + tamanho + cabecalho + dados
+
+
+def npz(arquivos: dict) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_DEFLATED) as pacote:
+        for nome, conteudo in arquivos.items():
+            pacote.writestr(nome + '.npy', conteudo)
+    return buffer.getvalue()
+
+
+class TesteLerNpzManual(unittest.TestCase):
+    def test_cabecalho_versao_2_e_big_endian(self):
+        conteudo = npz({
+            'angulos': npy_manual('>f8', (2, 2), struct.pack('>4d', 1.5, -2.0, 3.25, 0.0), versao=2),
+            'eventos/0': npy_manual('<i4', (3,), struct.pack('<3i', 7, -1, 42)),
+        })
+        arrays = ler_npz(conteudo)
+        self.assertEqual(arrays['angulos'], ((2, 2), [1.5, -2.0, 3.25, 0.0]))
+        self.assertEqual(arrays['eventos/0'], ((3,), [7, -1, 42]))
+        self.assertEqual(colunas_serie(arrays['angulos']), [[1.5, 3.25], [-2.0, 0.0]])
+
+    def test_texto_utf32(self):
+        nomes = ['joelho', 'quadril_e']
+        dados = b''.join(n.ljust(9, '\x00').encode('utf-32-le') for n in nomes)
+        self.assertEqual(ler_npz(npz({'nomes': npy_manual('<U9', (2,), dados)}))['nomes'], ((2,), nomes))
+
+    def test_escalar(self):
+        self.assertEqual(ler_npz(npz({'fps': npy_manual('<f4', (), struct.pack('<f', 30.0))}))['fps'], ((), [30.0]))
+
+    def test_ordem_fortran_recusada(self):
+        cabecalho = npy_manual('<f8', (2, 2), struct.pack('<4d', 0, 0, 0, 0)).replace(b"'fortran_order': False", b"'fortran_order': True ")
+        with self.assertRaises(ValueError):
+            ler_npz(npz({'a': cabecalho}))
+
+
+@unittest.skipIf(np is None, "NumPy não instalado")
+class TesteLerNpzIdaEVolta(unittest.TestCase):
+    """Compara ler_npz com numpy.load em arquivos gravados como o servidor grava (savez_compressed)."""
+
+    def comparar(self, **arrays):
+        buffer = io.BytesIO()
+        np.savez_compressed(buffer, **arrays)
+        lidos = ler_npz(buffer.getvalue())
+        carregados = np.load(io.BytesIO(buffer.getvalue()))
+        self.assertEqual(sorted(lidos), sorted(carregados.files))
+        for nome in carregados.files:
+            esperado = carregados[nome]
+            formato, valores = lidos[nome]
+            self.assertEqual(formato, esperado.shape, nome)
+            self.assertEqual(valores, esperado.ravel().tolist(), nome)
+
+    def test_tipos_do_servidor(self):
+        rng = np.random.default_rng(0)
+        self.comparar(**{
+            'angulos/Joelho': rng.normal(size=(900, 2)).astype(np.float32),
+            'kalman/media': rng.normal(size=(50, 3)),
+            'fases': rng.integers(-5, 5, size=120).astype(np.int32),
+            'quadros': rng.integers(0, 10 ** 12, size=7).astype(np.int64),
+            'detectado': rng.random(33) > 0.5,
+            'articulacoes': np.array(['Joelho', 'Quadril', 'Tornozelo']),
+            'fps_analise': np.float32(29.97),
+            'vazio': np.zeros((0, 3), np.float32),
+        })
+
+    def test_big_endian(self):
+        self.comparar(a=np.arange(6, dtype='>f8').reshape(2, 3), b=np.arange(4, dtype='>i4'))
+
+    def test_cabecalho_versao_2(self):
+        conteudo = io.BytesIO()
+        np.lib.format.write_array(conteudo, np.linspace(0, 1, 5), version=(2, 0))
+        self.assertEqual(ler_npz(npz({'x': conteudo.getvalue()}))['x'], ((5,), np.linspace(0, 1, 5).tolist()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,10 +2,15 @@ import time
 import os
 import sys
 import platform
+from contextlib import contextmanager
+import requests
 import undetected_chromedriver as uc
+from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.common.action_chains import ActionChains
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
 
 if sys.platform == "win32":
     import winreg
@@ -16,7 +21,21 @@ class GerenciadorColab:
         do Google Colab utilizando Selenium e drivers não detectáveis.
     """
 
-    def __init__(self, colab_url, modo_oculto=False):
+    # Tempo máximo (s) de cada espera. As esperas terminam assim que a condição na
+    # página é satisfeita; estes valores só limitam o pior caso.
+    TEMPO_MAX_LOGIN = 300
+    TEMPO_MAX_CARREGAMENTO = 60
+    TEMPO_MAX_POPUP = 10
+
+    # Elementos que só existem depois que a interface do notebook terminou de montar
+    SELETOR_NOTEBOOK_PRONTO = "colab-run-button, div.cell"
+    # Diálogos de confirmação ("não é de autoria do Google", "Executar mesmo assim")
+    SELETOR_POPUP = "mwc-dialog[open], md-dialog[open], colab-dialog, paper-dialog[opened]"
+
+    # Tempo máximo (s) da consulta ao /health de um servidor que já pode estar no ar
+    TEMPO_MAX_SAUDE = 5
+
+    def __init__(self, colab_url, modo_oculto=False, url_api=None):
         """
         Inicializa a instância do GerenciadorColab.
 
@@ -26,11 +45,69 @@ class GerenciadorColab:
             modo_oculto : bool, opcional
                 Define se o navegador deve rodar em modo headless (sem interface gráfica).
                 O padrão é False.
+            url_api : str, opcional
+                URL pública da API. Se informada e o servidor já estiver respondendo,
+                start_colab reaproveita a sessão em vez de reexecutar o notebook.
         """
 
         self.colab_url = colab_url
         self.modo_oculto = modo_oculto
+        self.url_api = url_api.rstrip('/') if url_api else None
         self.navegador = None
+        self.tempos = {} # Duração (s) de cada fase do boot
+
+    @contextmanager
+    def _medir_fase(self, nome):
+        """Registra em self.tempos a duração da fase executada no bloco."""
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.tempos[nome] = round(time.perf_counter() - inicio, 1)
+
+    def _esperar(self, condicao, tempo_max):
+        """
+        Espera explícita do Selenium, verificando a condição a cada 0,2 s.
+
+        Return:
+            O valor retornado pela condição, ou None se o tempo máximo acabar.
+        """
+        try:
+            return WebDriverWait(self.navegador, tempo_max, poll_frequency=0.2).until(condicao)
+        except TimeoutException:
+            return None
+
+    def servidor_ativo(self):
+        """
+        Consulta o /health da API para saber se o backend já está no ar.
+
+        Return:
+            dict: Resposta do /health, ou None se não houver URL ou o servidor não responder.
+        """
+        if not self.url_api:
+            return None
+        try:
+            resposta = requests.get(f"{self.url_api}/health", timeout=self.TEMPO_MAX_SAUDE)
+            if resposta.status_code == 200 and resposta.json().get('status') == 'online':
+                return resposta.json()
+        except (requests.exceptions.RequestException, ValueError):
+            pass
+        return None
+
+    def navegador_ativo(self):
+        """
+        Verifica se o navegador aberto por uma chamada anterior ainda responde.
+
+        Return:
+            bool: True se a janela continua aberta e controlável.
+        """
+        if self.navegador is None:
+            return False
+        try:
+            self.navegador.current_url
+            return True
+        except Exception:
+            return False
 
     def _obter_versao_chrome_instalada(self):
         """
@@ -69,14 +146,24 @@ class GerenciadorColab:
         Configura o driver do Chrome, gerencia o login (se necessário) e 
         executa todas as células do notebook.
 
+        Se a API já responde no /health (runtime ainda ativo de uma execução anterior,
+        inclusive de outra abertura do app), nada é reexecutado: a sessão é reaproveitada.
+
         O método realiza as seguintes etapas:
         1. Configura o perfil do Chrome para manter a sessão (cookies/auth).
         2. Inicia o navegador (undetected_chromedriver).
         3. Verifica se o login no Google é necessário.
-        4. Envia o comando de execução (Ctrl + F9).
-        5. Lida com pop-ups de confirmação ("Não sou um robô" ou avisos de execução)
-           usando navegação via teclado.
-        
+        4. Espera a interface do notebook terminar de carregar.
+        5. Envia o comando de execução (Ctrl + F9).
+        6. Lida com pop-ups de confirmação ("Não sou um robô" ou avisos de execução)
+           usando navegação via teclado, se algum aparecer.
+
+        Cada espera termina assim que a condição na página é satisfeita, e a duração
+        de cada fase fica em self.tempos.
+
+        Return:
+            list: Mensagens para o log da interface.
+
         Raises:
         ------
         Exception
@@ -84,6 +171,15 @@ class GerenciadorColab:
             para tratamento externo, se necessário.
         """
 
+        self.tempos = {}
+        # --- SERVIDOR JÁ NO AR: REAPROVEITA A SESSÃO ---
+        with self._medir_fase('saude'):
+            saude = self.servidor_ativo()
+        if saude:
+            estado = "modelos prontos" if saude.get('modelos_prontos') else "modelos ainda carregando"
+            return ["Servidor já está no ar: sessão reaproveitada, sem reexecutar o notebook.",
+                    f"Verificação em {self.tempos['saude']:.1f}s ({estado})."]
+
         opcoes = uc.ChromeOptions()  
         pasta_atual = os.getcwd()
         caminho_perfil = os.path.join(pasta_atual, "chrome_profile_auth")
@@ -97,30 +193,41 @@ class GerenciadorColab:
             opcoes.headless = True
 
         try:
-            print(f"Iniciando Navegador...")
-            versao_detectada = self._obter_versao_chrome_instalada()
-            self.navegador = uc.Chrome(options=opcoes, version_main=versao_detectada)
-            self.navegador.get(self.colab_url)
+            with self._medir_fase('navegador'):
+                # Janela de uma chamada anterior ainda aberta: só recarrega o notebook
+                if self.navegador_ativo():
+                    print("Reaproveitando o navegador já aberto...")
+                else:
+                    print(f"Iniciando Navegador...")
+                    versao_detectada = self._obter_versao_chrome_instalada()
+                    self.navegador = uc.Chrome(options=opcoes, version_main=versao_detectada)
+                self.navegador.get(self.colab_url)
 
             # --- VERIFICAÇÃO DE LOGIN ---
             if "accounts.google.com" in self.navegador.current_url:
                 print("LOGIN NECESSÁRIO! Faça login manual na janela que abriu.")
-                # Loop de espera até o usuário sair da página de login
-                while "accounts.google.com" in self.navegador.current_url:
-                    time.sleep(1)
+                # Espera até o usuário sair da página de login
+                with self._medir_fase('login'):
+                    if not self._esperar(lambda d: "accounts.google.com" not in d.current_url, self.TEMPO_MAX_LOGIN):
+                        raise Exception("Tempo esgotado aguardando o login no Google.")
                 print("Login detectado!")
-                time.sleep(5)
-            
+
             # --- EXECUÇÃO (Ctrl + F9) ---
             print("Aguardando carregamento total da interface do Colab...")
-            time.sleep(10) 
+            with self._medir_fase('carregamento'):
+                pronto = self._esperar(
+                    lambda d: d.execute_script("return document.readyState") == "complete"
+                    and d.find_elements(By.CSS_SELECTOR, self.SELETOR_NOTEBOOK_PRONTO),
+                    self.TEMPO_MAX_CARREGAMENTO)
+                if not pronto:
+                    print("Interface do notebook não identificada; enviando o comando mesmo assim.")
+                corpo = self._esperar(EC.element_to_be_clickable((By.TAG_NAME, 'body')), self.TEMPO_MAX_CARREGAMENTO)
 
             print("Enviando comando 'Executar Tudo' (Ctrl+F9)...")
 
             try:
                 # Clica no corpo da página para garantir o foco
-                self.navegador.find_element(By.TAG_NAME, 'body').click()
-                time.sleep(0.5)
+                (corpo or self.navegador.find_element(By.TAG_NAME, 'body')).click()
 
                 ActionChains(self.navegador)\
                     .key_down(Keys.CONTROL)\
@@ -134,26 +241,28 @@ class GerenciadorColab:
             # --- TRATAMENTO DE POP-UPS (TÁTICA DO TECLADO) ---
             # O Google Colab frequentemente exibe um pop-up de "Aviso: Este notebook não é de autoria do Google"
             # ou "Executar mesmo assim". A sequência TAB -> TAB -> ENTER visa focar e aceitar esse botão.
-            print("👀 Aguardando possível pop-up de confirmação (10s)...")
-            time.sleep(10) # Tempo para o pop-up animar e renderizar na tela
-
-            acoes = ActionChains(self.navegador)
-
-            # Sequência de navegação para focar no botão de confirmação padrão
-            acoes.send_keys(Keys.TAB).perform()
-            time.sleep(1)
-            acoes.send_keys(Keys.TAB).perform()
-            time.sleep(1)
-            acoes.send_keys(Keys.ENTER).perform()
+            print(f"👀 Aguardando possível pop-up de confirmação (até {self.TEMPO_MAX_POPUP}s)...")
+            with self._medir_fase('popup'):
+                popup = self._esperar(EC.visibility_of_element_located((By.CSS_SELECTOR, self.SELETOR_POPUP)), self.TEMPO_MAX_POPUP)
+                if popup:
+                    # Sequência de navegação para focar no botão de confirmação padrão
+                    acoes = ActionChains(self.navegador)
+                    acoes.send_keys(Keys.TAB).pause(0.2).send_keys(Keys.TAB).pause(0.2).send_keys(Keys.ENTER).perform()
+                    # O diálogo fechado confirma que a execução foi aceita
+                    self._esperar(EC.invisibility_of_element(popup), self.TEMPO_MAX_POPUP)
+                    print("Sequência de teclas (TAB, TAB, ENTER) enviada via ActionChains para fechar pop-ups.")
+                else:
+                    print("Nenhum pop-up de confirmação apareceu.")
 
-            print("Sequência de teclas (TAB, TAB, ENTER) enviada via ActionChains para fechar pop-ups.")
+            fases = ", ".join(f"{fase} {segundos:.1f}s" for fase, segundos in self.tempos.items())
             msg = []
             msg.append("Execução do Servidor iniciada com sucesso!")
-            msg.append("Aguarde ~2minutos para estar pronto para uso.")
+            msg.append(f"Tempo por fase do boot: {fases}. Aguardando a API responder...")
             return msg
 
         except Exception as e:
             print(f"Erro crítico durante a execução: {e}")
             if self.navegador:
                 self.navegador.quit()
+                self.navegador = None
             raise e
\ No newline at end of file